@@ -1 +1,10 @@
-from .core.Scheduler import Scheduler
\ No newline at end of file
+__version__ = "0.1.0"
+
+
+def __getattr__(name):
+    # Resolve Scheduler lazily so importing processmanager.cli (or any other
+    # submodule) doesn't drag in the whole core package and its dependencies.
+    if name == "Scheduler":
+        from .core.Scheduler import Scheduler
+        return Scheduler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,186 +1,253 @@
 #!/home/kyle/anaconda3/envs/pysystemenv/bin/python
-import argparse
-import json
-import importlib
+from __future__ import annotations
+
 import os
 import sys
-import contextlib
-import logging
-from pathlib import Path
-from tabulate import tabulate
-from processmanager.core.utils import load_schedules
-from processmanager.core.logger_setup import setup_pm_logging, get_logger
-from processmanager.core.supervisor_manager import reload_supervisor
-from processmanager.config import Config, config # Import class def and object
-from processmanager.core.Task import Task
-from processmanager.core.utils import get_job_sched
-import processmanager
+from typing import TYPE_CHECKING
+
+# Everything else, argparse included, is imported inside the command that
+# needs it, so `pm --help`, `pm reload` and argparse errors don't pay for
+# logging setup or the core job classes.
+if TYPE_CHECKING:
+    from processmanager.config import Config
 
 pm_logger = None
 
-def list_status(config: Config):
-    """Lists the status of configured programs and tasks in three separate tables."""
-    schedules, valid_hash = load_schedules(config.schedule_file)
-    pm_logger = get_logger("process_manager")
+# Tasks shipped with the package live here; the tasks table shortens their
+# paths to "tasks/<file>".
+TASKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tasks")
+TASKS_DIR_PREFIX = os.path.realpath(TASKS_DIR) + os.sep
 
+# Printed for `pm`, `pm -h`/`--help` without building the argparse parser.
+# Keep in sync with the arguments defined in main().
+USAGE = """\
+usage: pm [-h] [--version] [-v] {list,stop,start,reload,run} [job_name]
 
-    # ── 1) Schedule Valid table ───────────────────────────────────────────────
-    field_table = [["Schedule Valid", str(valid_hash)]]
-    print(tabulate(field_table,
-                   tablefmt="rounded_outline"))
-    print()  # blank line between tables
+Simple Process Manager CLI
 
-    # ── 2) Programs table ────────────────────────────────────────────────────
-    prog_rows = []
-    for schedule in schedules:
-        
-        if schedule.get("type") != "program":
-            continue
+positional arguments:
+  {list,stop,start,reload,run}
+                        Command to perform: list program/task status, stop a
+                        program, or start a program.
+  job_name              Name of the program for stop/start commands.
+
+options:
+  -h, --help            show this help message and exit
+  --version             show program's version number and exit
+  -v, --verbose         Enable verbose (debug) logging."""
+
+
+class _QuietLogger:
+    """
+    Drop records from a single logger while a program's monitor runs, so its
+    output doesn't break up the status table. Unlike logging.disable() this
+    leaves every other logger alone. Does nothing in verbose mode.
+    """
+    def __init__(self, logger):
+        import logging
+        self.logger = logger
+        self.active = not logging.getLogger().isEnabledFor(logging.DEBUG)
 
-        name       = schedule.get("name", "")
-        class_path = schedule.get("program_class", "")
-        start_time = None
-        last_checkup = None
-        disable_restart = None
+    @staticmethod
+    def _drop(record):
+        return False
 
+    def __enter__(self):
+        if self.active:
+            self.logger.addFilter(self._drop)
+        return self
+
+    def __exit__(self, *exc):
+        if self.active:
+            self.logger.removeFilter(self._drop)
+        return False
+
+
+def _resolve_classes(prog_scheds):
+    """
+    Resolve every distinct program_class up front. Import failures are
+    logged once per class path and map to None.
+    """
+    from processmanager.core.BaseProgram import BaseProgram
+
+    classes = {}
+    paths = {s.get("program_class", "") for s in prog_scheds}
+    for class_path in (p for p in paths if "." in p):
         try:
-            # split into full module path + class
-            mod_name, cls_name = class_path.rsplit(".", 1)
+            classes[class_path] = BaseProgram.resolve(class_path)
+        except Exception as e:
+            pm_logger.error(f"Could not load program class '{class_path}': {e}")
+            classes[class_path] = None
+    return classes
+
 
-            # derive the "short" module (last segment) + class
-            short_mod = mod_name.split(".")[-1]
-            short_path = f"{short_mod}.{cls_name}"
+def _program_row(schedule, config: Config, classes, statuses):
+    """Build one row of the programs table, running the program's monitor."""
+    from processmanager.core.utils import short_class_path
 
+    name       = schedule.get("name", "")
+    class_path = schedule.get("program_class", "")
+    start_time = None
+    last_checkup = None
+    disable_restart = None
 
-            module = importlib.import_module(mod_name)
-            cls    = getattr(module, cls_name)
-            prog   = cls(schedule, config)
+    # Nothing to import: report it in the row instead of raising on rsplit.
+    if "." not in class_path:
+        return [name, class_path, "no class_path" if not class_path else "invalid class_path",
+                start_time, last_checkup, disable_restart]
 
-            pm_logger.debug(f"Program type: {type(prog)}, instance: {prog}")
+    short_path = short_class_path(class_path)
+    # Fallback in case loading or monitoring the program fails below.
+    program_status = "error"
 
-            # Run monitor func for program to check status
-            if hasattr(prog, "custom_monitor"):
-                # silence all output
-                # pm_logger.info(f"Running monitor for program '{name}'")
-                print(f"Running {name} monitor", end="\r", flush=True)
-                # logging.disable(logging.CRITICAL + 1)
+    try:
+        cls    = classes[class_path]
+        if cls is None:
+            raise ImportError(f"program class '{class_path}' is unavailable")
+        prog   = cls(schedule, config)
+
+        pm_logger.debug(f"Program type: {type(prog)}, instance: {prog}")
 
+        # Run monitor func for program to check status
+        if hasattr(prog, "custom_monitor"):
+            # silence the program's own logger while its monitor runs
+            with _QuietLogger(prog.job_logger):
                 status = prog.custom_monitor()
 
-                is_stopped = True if status in ["RESTART", "SILENT_RESTART"] else False
+            is_stopped = True if status in ["RESTART", "SILENT_RESTART"] else False
 
-                # logging.disable(logging.NOTSET)
-                program_status = "stopped" if is_stopped else "running"
-                pm_logger.debug(f"Program '{name}' status: {program_status}")
-            else:
-                program_status = "unknown (no custom_monitor)"
-            
+            program_status = "stopped" if is_stopped else "running"
+            pm_logger.debug(f"Program '{name}' status: {program_status}")
+        else:
+            program_status = "unknown (no custom_monitor)"
 
-            status_dict = prog.read_status() 
+        status_dict = statuses.get(name, {})
 
-            start_time      = status_dict.get('time_started')
-            last_checkup    = status_dict.get('last_checkup')
-            disable_restart = status_dict.get('disable_restart', False)
+        start_time      = status_dict.get('time_started')
+        last_checkup    = status_dict.get('last_checkup')
+        disable_restart = status_dict.get('disable_restart', False)
 
-        except Exception as e:
-            print(f"Error: {e}")
+    except Exception as e:
+        pm_logger.error(f"Error checking program '{name}': {e}")
 
-        # Load in status dict
-        prog_rows.append([name, short_path, program_status, 
-                          start_time, last_checkup, disable_restart])
+    # Load in status dict
+    return [name, short_path, program_status,
+            start_time, last_checkup, disable_restart]
 
-    print(" " * 30, end="\r")
 
-    print(tabulate(prog_rows,
-                   headers=["Name", "Class Path", "Status", "Started", "Last Checkup", "Disable Restart"],
-                   tablefmt="rounded_outline"))
-    print()
+def _task_row(schedule, statuses):
+    """Build one row of the tasks table from the schedule and status file."""
+    name      = schedule.get("name", "")
+    main_path = schedule.get("main_path", "")
+    start     = schedule.get("start", "")
+    freq      = schedule.get("freq", "")
 
-    # ── 3) Tasks table ───────────────────────────────────────────────────────
+    # (2) Make a “tasks/<filename>” short path if main_path is under TASKS_DIR,
+    # otherwise show the full path. Plain string work: no resolve() syscalls.
+    display_path = main_path  # default
+    if main_path:
+        abs_path = os.path.abspath(main_path)
+        if abs_path.startswith(TASKS_DIR_PREFIX):
+            display_path = f"tasks/{os.path.basename(abs_path)}"  # e.g. “tasks/foo_task.py”
+
+    status_dict = statuses.get(name, {})
+    last_ran = status_dict.get("last-ran", "")
+    last_err = status_dict.get("last-err", "")
+
+    return [name, display_path, start, freq, last_ran, last_err]
 
-    PM_ROOT = Path(processmanager.__file__).parent
-    TASKS_DIR   = PM_ROOT / "tasks"
 
-    task_rows = []
+def list_status(config: Config):
+    """Lists the status of configured programs and tasks in three separate tables."""
+    from processmanager.core.utils import load_schedules, load_all_statuses, render_table
+
+    schedules, valid_hash = load_schedules(config.schedule_file)
+    # One directory pass for every job's status file, instead of opening
+    # them one by one as each row is built.
+    statuses = load_all_statuses(config.status_dir)
+
+    # Split the schedules once instead of re-scanning the list per table.
+    prog_scheds, task_scheds = [], []
     for schedule in schedules:
-        if schedule.get("type") != "task":
-            continue
-        name      = schedule.get("name", "")
-        main_path = schedule.get("main_path", "")
-        start     = schedule.get("start", "")
-        freq      = schedule.get("freq", "")
-
-        # (2) Attempt to make a “tasks/<filename>” short path if main_path is under TASKS_DIR:
-        display_path = main_path  # default
-        try:
-            p = Path(main_path).resolve()
-            rel = p.relative_to(TASKS_DIR)  # will succeed only if main_path starts with TASKS_DIR
-            display_path = f"tasks/{rel.name}"  # e.g. “tasks/foo_task.py”
-        except Exception:
-            # either main_path isn’t under TASKS_DIR, or resolution failed—fall back to full path
-            display_path = main_path
+        job_type = schedule.get("type")
+        if job_type == "program":
+            prog_scheds.append(schedule)
+        elif job_type == "task":
+            task_scheds.append(schedule)
 
-        task = Task(schedule, config)
-        status_dict = task.read_status()
-        last_ran = status_dict.get("last-ran", "")
-        last_err = status_dict.get("last-err", "")
+    # ── 1) Schedule Valid table ───────────────────────────────────────────────
+    field_table = [["Schedule Valid", str(valid_hash)]]
+    print(render_table(field_table))
+    print()  # blank line between tables
 
-        task_rows.append([name, display_path, start, freq, last_ran, last_err])
+    # ── 2) Programs table ────────────────────────────────────────────────────
+    classes = _resolve_classes(prog_scheds)
 
-    print(tabulate(
-        task_rows,
-        headers=["Name", "Task Path", "Start", "Freq", "Last Ran", "Last Err"],
-        tablefmt="rounded_outline"
-    ))
+    # Monitors are independent and mostly wait on I/O (sockets, /proc,
+    # mounts), so run them side by side; map() keeps the schedule order.
+    prog_rows = []
+    if prog_scheds:
+        from concurrent.futures import ThreadPoolExecutor
 
+        print(f"Running {len(prog_scheds)} program monitors", end="\r", flush=True)
+        with ThreadPoolExecutor(max_workers=min(32, len(prog_scheds))) as ex:
+            prog_rows = list(ex.map(lambda s: _program_row(s, config, classes, statuses), prog_scheds))
+        print(" " * 40, end="\r")
 
+    print(render_table(prog_rows,
+                       ["Name", "Class Path", "Status", "Started", "Last Checkup", "Disable Restart"]))
+    print()
 
-def stop_program(program_name, config: Config):
-    """
-    Finds the schedule for a given program, instantiates its class,
-    calls its stop() method, and updates its status file to set disable_restart = True.
-    """
-    prog_sched = get_job_sched(program_name, "program", config.schedule_file) 
-    class_path = prog_sched['program_class']
-    
-    try:
-        module_name, class_name = class_path.rsplit(".", 1)
-        module = importlib.import_module(module_name)
-        cls = getattr(module, class_name)
-        # Instantiate the program using its config.
-        prog = cls(prog_sched, config)
+    # ── 3) Tasks table ───────────────────────────────────────────────────────
+    task_rows = [_task_row(schedule, statuses) for schedule in task_scheds]
 
-        prog.disable_restart(True)
-        prog.stop()
-        pm_logger.info(f"Program '{program_name}' stopped and disable_restart set to True.")
+    print(render_table(task_rows, ["Name", "Task Path", "Start", "Freq", "Last Ran", "Last Err"]))
 
-    except Exception as e:
-        pm_logger.error(f"Error stopping program '{program_name}': {e}")
 
-def start_program(program_name, config: Config):
+
+def _control_program(program_name, config: Config, action):
     """
-    Finds the schedule for a given program, instantiates its class,
-    calls its start() method, and updates its status file to set disable_restart = False.
+    Finds the schedule for a given program, instantiates its class and calls
+    its stop() or start() method, setting disable_restart in its status file
+    to match. The record_start/record_stop decorators write the flag along
+    with the rest of the status.
     """
+    from processmanager.core.utils import get_job_sched
+    from processmanager.core.BaseProgram import BaseProgram
 
-    prog_sched = get_job_sched(program_name, "program", config.schedule_file) 
+    prog_sched = get_job_sched(program_name, "program", config.schedule_file)
     class_path = prog_sched['program_class']
 
     try:
-        module_name, class_name = class_path.rsplit(".", 1)
-        module = importlib.import_module(module_name)
-        cls = getattr(module, class_name)
+        cls = BaseProgram.resolve(class_path)
+        # Instantiate the program using its config.
         prog = cls(prog_sched, config)
 
-        # Call program start, discard result
-        prog.start()
-        prog.disable_restart(False)
-        pm_logger.debug(f"Program '{program_name}' started and disable restart set to False.")
+        if action == "stop":
+            prog.stop_and_disable_restart()
+            pm_logger.info(f"Program '{program_name}' stopped and disable_restart set to True.")
+        else:
+            # Call program start, discard result
+            prog.start_and_enable_restart()
+            pm_logger.debug(f"Program '{program_name}' started and disable restart set to False.")
+
     except Exception as e:
-        pm_logger.error(f"Error starting program '{program_name}': {e}")
+        verb = "stopping" if action == "stop" else "starting"
+        pm_logger.error(f"Error {verb} program '{program_name}': {e}")
+
+
+def stop_program(program_name, config: Config):
+    """Stops a program and disables its automatic restart."""
+    _control_program(program_name, config, "stop")
+
+def start_program(program_name, config: Config):
+    """Starts a program and re-enables its automatic restart."""
+    _control_program(program_name, config, "start")
 
 
 def run_task(task_name, config: Config):
+    from processmanager.core.Task import Task
+    from processmanager.core.utils import get_job_sched
 
     task_sched = get_job_sched(task_name, "task", config.schedule_file) 
 
@@ -195,50 +262,94 @@ def run_task(task_name, config: Config):
        pm_logger.error(f"Error running task {task_name}, {e}") 
 
         
-def main():
-    """Main entry point for the command-line script."""
-    parser = argparse.ArgumentParser(description="Simple Process Manager CLI")
-    parser.add_argument("command", choices=["list", "stop", "start", "reload", "run"],
-                        help="Command to perform: list program/task status, stop a program, or start a program.")
-    parser.add_argument("job_name", nargs="?", default=None,
-                        help="Name of the program for stop/start commands.")
-    parser.add_argument("-v", "--verbose", action="store_true",
-                        help="Enable verbose (debug) logging.")
-
-    args = parser.parse_args()
+def _setup(args):
+    """Load the config and set up logging for commands that need them."""
+    import logging
+    from processmanager.config import config
+    from processmanager.core.logger_setup import setup_pm_logging, get_logger
 
     # Set logging level based on verbose flag
     level = logging.DEBUG if args.verbose else logging.INFO
     setup_pm_logging(config.log_dir, level, mark_restart=False)
-    
+
     # Use a global logger
     global pm_logger
     pm_logger = get_logger("process_manager")
-    
-    if args.command == "list":
-        list_status(config)
+    return config
 
-    elif args.command == "stop":
-        if args.job_name is None:
-            raise Exception("Error: Please specify a program name to stop.")
-        
-        stop_program(args.job_name, config)
 
-    elif args.command == "start":
-        if args.job_name is None:
-            raise Exception("Error: Please specify a program name to start.")
-        
-        start_program(args.job_name, config)
+def _cmd_list(args):
+    list_status(_setup(args))
+
+def _cmd_stop(args):
+    config = _setup(args)
+    if args.job_name is None:
+        raise Exception("Error: Please specify a program name to stop.")
+    stop_program(args.job_name, config)
+
+def _cmd_start(args):
+    config = _setup(args)
+    if args.job_name is None:
+        raise Exception("Error: Please specify a program name to start.")
+    start_program(args.job_name, config)
 
-    elif args.command == "run":
-        if args.job_name is None:
-            raise Exception("Error: Please specify a task name to run.")
+def _cmd_run(args):
+    config = _setup(args)
+    if args.job_name is None:
+        raise Exception("Error: Please specify a task name to run.")
+    run_task(args.job_name, config)
 
-        run_task(args.job_name, config)
+def _cmd_reload(args):
+    # Only shells out to supervisorctl and prints the result; no config or
+    # logging setup needed.
+    from processmanager.core.supervisor_manager import reload_supervisor
+    reload_supervisor()
 
-    elif args.command == "reload":
-        reload_supervisor()
 
+# Each handler is the only place its command's dependencies get imported.
+_HANDLERS = {
+    "list":   _cmd_list,
+    "stop":   _cmd_stop,
+    "start":  _cmd_start,
+    "reload": _cmd_reload,
+    "run":    _cmd_run,
+}
+
+
+def main():
+    """Main entry point for the command-line script."""
+    from processmanager import __version__
+
+    # Fast path: help/version never need the parser, config or logging.
+    # Like argparse, the first -h/--help/--version before "--" wins wherever
+    # it appears, so `pm list -h` is as cheap as `pm -h`.
+    argv = sys.argv[1:]
+    if not argv:
+        print(USAGE)
+        return
+    for arg in argv:
+        if arg == "--":
+            break
+        if arg in ("-h", "--help"):
+            print(USAGE)
+            return
+        if arg == "--version":
+            print(f"pm {__version__}")
+            return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="pm", description="Simple Process Manager CLI")
+    parser.add_argument("command", choices=list(_HANDLERS),
+                        help="Command to perform: list program/task status, stop a program, or start a program.")
+    parser.add_argument("job_name", nargs="?", default=None,
+                        help="Name of the program for stop/start commands.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Enable verbose (debug) logging.")
+
+    args = parser.parse_args()
+    _HANDLERS[args.command](args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
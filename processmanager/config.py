@@ -1,15 +1,16 @@
 from dataclasses import dataclass
-from pathlib import Path
 
+# Plain strings: everything downstream joins or formats these into paths, and
+# nothing needs Path methods. Wrap in Path() locally where that changes.
 @dataclass(frozen=True)
 class Config:
-    schedule_file: Path
-    status_dir:    Path
-    log_dir:       Path
+    schedule_file: str
+    status_dir:    str
+    log_dir:       str
 
 # then, to instantiate:
 config = Config(
-    schedule_file=Path("/home/kyle/projects/processmanager/schedules/2_26_26.json"),
-    status_dir=   Path("/home/kyle/projects/processmanager/statuses"),
-    log_dir=      Path("/home/kyle/projects/processmanager/logs"),
+    schedule_file="/home/kyle/projects/processmanager/schedules/2_26_26.json",
+    status_dir=   "/home/kyle/projects/processmanager/statuses",
+    log_dir=      "/home/kyle/projects/processmanager/logs",
 )
\ No newline at end of file
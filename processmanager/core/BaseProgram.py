@@ -6,15 +6,60 @@ import os
 import json
 import logging
 
-from datetime import datetime
-from abc import ABC, abstractmethod
 from .Job import Job
+from .utils import timestamp, resolve_class
 from functools import wraps
 # from .logger_setup import setup_logger 
 from ..config import Config
 
+def _pid_alive(pid):
+    """True if pid exists and isn't a zombie waiting to be reaped."""
+    try:
+        os.kill(pid, 0)  # Signal 0: check for existence.
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    except OSError:
+        return False
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            # state is the field after "(comm)"; comm may contain spaces
+            return f.read().rsplit(b")", 1)[1].split()[0] != b"Z"
+    except (OSError, IndexError):
+        return True
+
+
+def _seconds_of_day(t):
+    """datetime.time -> seconds since midnight, passing None through."""
+    if t is None:
+        return None
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
 class BaseProgram(Job):
-    
+
+    # "module.ClassName" -> class, filled in as subclasses are defined.
+    _REGISTRY = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        BaseProgram._REGISTRY[f"{cls.__module__}.{cls.__qualname__}"] = cls
+
+    @staticmethod
+    def resolve(class_path):
+        """
+        Return the BaseProgram subclass for a schedule's program_class.
+        Already-imported programs are a registry hit; anything else is
+        imported and must register itself by doing so.
+        """
+        cls = BaseProgram._REGISTRY.get(class_path)
+        if cls is None:
+            cls = resolve_class(class_path)
+            if not (isinstance(cls, type) and issubclass(cls, BaseProgram)):
+                raise TypeError(f"'{class_path}' must extend BaseProgram")
+        return cls
+
     def __init__(self, schedule, config: Config):
 
         """
@@ -29,6 +74,8 @@ class BaseProgram(Job):
         self.keep_alive = schedule.get('keep_alive', False)
         self.check_alive_freq = self.parse_frequency(schedule.get('check_alive_freq', '1 m'))
         self.max_retries = schedule.get('max_retries', 0)
+        # last_checkup is diagnostic only; write it at most this often.
+        self.checkup_interval = self.parse_frequency(schedule.get('checkup_interval', '60 s'))
         self.run_on_start = schedule.get('run_on_start', False)
 
         # Optional schedule times for programs.
@@ -37,35 +84,90 @@ class BaseProgram(Job):
 
         self.schedule_start = self.parse_time_str(start_str) if start_str else None
         self.schedule_end = self.parse_time_str(end_str) if end_str else None
+        # Seconds of day, so within_schedule() compares ints each tick.
+        self._schedule_start_s = _seconds_of_day(self.schedule_start)
+        self._schedule_end_s = _seconds_of_day(self.schedule_end)
 
         # Set the default monitor function.
         self.monitor_func = self.default_monitor
 
         self.retries = 0
         self.process = None
+        self._last_checkup_ts = None  # None: write on the first pass
+        # True when running under the scheduler, so connections may be kept
+        # across monitor passes; set by Scheduler.initialize(). False for
+        # one-shot CLI checks (e.g. `pm list`).
+        self.persistent = False
+        # disable_restart value for record_start/record_stop to fold into
+        # their status write; set by start_and_enable_restart() and
+        # stop_and_disable_restart().
+        self._pending_restart_flag = None
 
 
     def default_monitor(self):
         # Check if the process is running by reading the status file.
-        pid_running = False
-        status = self.read_status()
-        if status and status.get("pid", 0):
-            pid = status.get("pid")
+        status = self.read_status() or {}
+        pid = status.get("pid", 0)
+        if not pid:
+            return "RESTART"
+
+        # Our own child: poll() reaps it once it exits. os.kill(pid, 0)
+        # would keep succeeding on the unreaped zombie and report it alive.
+        if self.process is not None and self.process.pid == pid:
+            return "SUCCESS" if self.process.poll() is None else "RESTART"
+
+        # Started by another process (e.g. `pm start`), fall back to the pid.
+        return "SUCCESS" if _pid_alive(pid) else "RESTART"
+
+    def wait_for_exit(self, pid, timeout):
+        """
+        Wait up to timeout seconds for pid to exit, returning as soon as it
+        does. True if it exited. Our own child is reaped via wait(); anything
+        else is polled.
+        """
+        if self.process is not None and self.process.pid == pid:
             try:
-                os.kill(pid, 0)  # Signal 0: check for existence.
-                pid_running = True
-            except OSError:
-                pid_running = False
-        else:
-            pid_running = False
+                self.process.wait(timeout=timeout)
+                return True
+            except subprocess.TimeoutExpired:
+                return False
 
-        return "SUCCESS" if pid_running else "RESTART"
+        deadline = time.monotonic() + timeout
+        while _pid_alive(pid):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+        return True
 
     def disable_restart(self, bool):
-        status = self.read_status()
+        status = self.read_status() or {}
         status['disable_restart'] = bool 
         self.write_status(status)
-        
+
+    def _take_restart_flag(self):
+        flag, self._pending_restart_flag = self._pending_restart_flag, None
+        return flag
+
+    def _control(self, method, flag):
+        # record_start/record_stop take the flag and write it with the rest
+        # of the status; for undecorated start()/stop() it's written here.
+        self._pending_restart_flag = flag
+        try:
+            result = method()
+        finally:
+            flag = self._take_restart_flag()
+        if flag is not None:
+            self.disable_restart(flag)
+        return result
+
+    def stop_and_disable_restart(self):
+        """Stop the program and set disable_restart so the monitor leaves it down."""
+        return self._control(self.stop, True)
+
+    def start_and_enable_restart(self):
+        """Start the program and clear disable_restart."""
+        return self._control(self.start, False)
+
     @staticmethod
     def record_start(func):
         """
@@ -74,10 +176,13 @@ class BaseProgram(Job):
         If found, it kills that process.
         After a successful start (i.e. a PID is returned), writes the status JSON
         file with pid, time_started, and num_retries.
+        A pending disable_restart flag (see start_and_enable_restart) goes
+        into the same write.
         Also updates shared state if available.
         """
         @wraps(func)
         def wrapper(self, *args, **kwargs):
+            disable_restart = self._take_restart_flag()
             # Check if a status file exists with an active pid.
             status = self.read_status()
             if status and status.get("pid", 0):
@@ -95,11 +200,15 @@ class BaseProgram(Job):
             if pid:
                 new_status = {
                     "pid": pid,
-                    "time_started": datetime.now().isoformat(sep=' ', timespec='seconds'),
+                    "time_started": timestamp(),
                     "num_retries": self.retries,
                     "status": "running"
                 }
+                if disable_restart is not None:
+                    new_status["disable_restart"] = disable_restart
                 self.write_status(new_status)
+            elif disable_restart is not None:
+                self.disable_restart(disable_restart)
             return pid
         return wrapper
 
@@ -108,94 +217,110 @@ class BaseProgram(Job):
         """
         Decorator for stop() methods.
         After stopping, update the status JSON file to set pid to 0 and status to 'stopped'.
+        A pending disable_restart flag (see stop_and_disable_restart) goes
+        into the same write.
         Also updates shared state if available.
         """
         @wraps(func)
         def wrapper(self, *args, **kwargs):
+            disable_restart = self._take_restart_flag()
             result = func(self, *args, **kwargs)
-            status = self.read_status()
+            status = self.read_status() or {}
             status["pid"] = 0
             status["time_started"] = None
             status["num_retries"] = self.retries
             status["status"] = "stopped"
+            if disable_restart is not None:
+                status["disable_restart"] = disable_restart
             
             self.write_status(status)
             return result
         return wrapper
 
-    @abstractmethod
     def start(self):
         """
         Abstract method for starting the program.
         Child classes must override start() with the actual start logic.
         The returned value should be the PID of the spawned process.
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement start()")
 
-    @abstractmethod
     def stop(self):
         """
         Abstract method for stopping the program.
         Child classes must override stop() with the actual stop logic.
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement stop()")
 
-    def monitor(self):
+    def monitor_tick(self):
         """
-        Repeatedly checks whether the program needs a restart.
+        One pass of the monitor loop: checks whether the program needs a restart.
         If the current time is outside the scheduled window, the program is stopped.
         Otherwise, if the monitor function signals a restart and keep_alive is True, the program is restarted.
-        If keep_alive is False, the monitor loop ends.
+        Returns the seconds until the next pass, or None when monitoring should end
+        (keep_alive is False, or max retries were exceeded).
         """
-        while True:
-            # Read the current status from the status file.
-            current_status = self.read_status() or {}
-            
-            # Check for disable flag before proceeding.
-            if current_status.get("disable_restart", False):
-                self.job_logger.info(f"Program '{self.name}' is disabled. Skipping monitor loop.")
-                time.sleep(self.check_alive_freq)
-                continue
+        # Read the current status from the status file.
+        current_status = self.read_status() or {}
+        
+        # Check for disable flag before proceeding.
+        if current_status.get("disable_restart", False):
+            self.job_logger.info(f"Program '{self.name}' is disabled. Skipping monitor loop.")
+            return self.check_alive_freq
 
-            current_status["last_checkup"] = datetime.now().isoformat(sep=' ', timespec='seconds')
+        # Heartbeat: rewrite the status file at most every checkup_interval
+        # seconds, so fast monitors don't write on every pass while
+        # last_checkup is never more than about a minute (by default) stale.
+        # start/stop write the status themselves on any transition.
+        now_ts = int(time.time())
+        if self._last_checkup_ts is None or now_ts - self._last_checkup_ts >= self.checkup_interval:
+            current_status["last_checkup"] = timestamp(now_ts)
             self.write_status(current_status)
+            self._last_checkup_ts = now_ts
 
-            if not self.within_schedule():
-                if self.process and self.process.poll() is None:
-                    self.job_logger.info(f"Program '{self.name}' is outside its scheduled time. Stopping.")
-                    self.stop()
-                time.sleep(self.check_alive_freq)
-                continue
-
-            status = self.monitor_func()
+        if not self.within_schedule():
+            if self.process and self.process.poll() is None:
+                self.job_logger.info(f"Program '{self.name}' is outside its scheduled time. Stopping.")
+                self.stop()
+            return self.check_alive_freq
 
-            if status in ["RESTART", "SILENT_RESTART"]:
-                self.job_logger.warning(f"Monitor: Program '{self.name}' needs restart.")
+        status = self.monitor_func()
 
-                if not self.keep_alive:
-                    self.job_logger.info(f"Keep alive flag is false for '{self.name}'. Ending monitor loop.")
-                    break
+        if status in ["RESTART", "SILENT_RESTART"]:
+            self.job_logger.warning(f"Monitor: Program '{self.name}' needs restart.")
 
-                self.retries += 1
-                if self.retries <= self.max_retries:
-                    self.job_logger.info(f"Restarting program '{self.name}', attempt {self.retries}.")
-                    self.start()
+            if not self.keep_alive:
+                self.job_logger.info(f"Keep alive flag is false for '{self.name}'. Ending monitor loop.")
+                return None
 
-                    if status == "RESTART":
-                        self.notify_down(additional_info="")
+            self.retries += 1
+            if self.retries <= self.max_retries:
+                self.job_logger.info(f"Restarting program '{self.name}', attempt {self.retries}.")
+                self.start()
 
-                else:
-                    self.job_logger.error(f"Max retries reached for '{self.name}'. No further attempts will be made.")
-                    self.notify_failure(additional_info="Exceeded max retries.")
-                    break
+                if status == "RESTART":
+                    self.notify_down(additional_info="")
 
             else:
-                if status == "NOTIFY_SUCCESS":
-                    self.notify_up(additional_info="")
-                    
-                self.job_logger.debug(f"Program '{self.name}' is running fine.")
-                self.retries = 0
+                self.job_logger.error(f"Max retries reached for '{self.name}'. No further attempts will be made.")
+                self.notify_failure(additional_info="Exceeded max retries.")
+                return None
 
-            time.sleep(self.check_alive_freq)
+        else:
+            if status == "NOTIFY_SUCCESS":
+                self.notify_up(additional_info="")
+                
+            self.job_logger.debug(f"Program '{self.name}' is running fine.")
+            self.retries = 0
 
+        return self.check_alive_freq
 
+    def monitor(self):
+        """
+        Runs monitor_tick() on the calling thread until it asks to stop.
+        The scheduler drives monitor_tick() from its shared timer queue instead.
+        """
+        delay = self.monitor_tick()
+        while delay is not None:
+            time.sleep(delay)
+            delay = self.monitor_tick()
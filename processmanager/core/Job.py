@@ -1,15 +1,105 @@
 import os
+import re
+import time
+import queue
+import atexit
 import logging
-import json
+import functools
+import threading
 
-from datetime import datetime
-from abc import ABC, abstractmethod
+from datetime import time as dt_time
 from .logger_setup import get_logger
+from .utils import json_loads, json_dumps, timestamp
 from ..config import Config
 
-from .emailing import send_mail_msg
 
-class Job(ABC):
+# Notifications go through a queue drained by one background thread, so a
+# monitor tick never waits on an SMTP round trip.
+_MAIL_Q = queue.Queue()
+_MAIL_DEBOUNCE = 60  # seconds; identical (subject, body) repeats within this are dropped
+_mail_lock = threading.Lock()
+_mail_thread = None
+_mail_last_queued = {}  # (subject, body) -> time.monotonic() it was last queued
+
+
+def _queue_mail(body, subject):
+    """Queue a notification for the background sender and return at once."""
+    global _mail_thread
+    now = time.monotonic()
+    key = (subject, body)
+    with _mail_lock:
+        last = _mail_last_queued.get(key)
+        if last is not None and now - last < _MAIL_DEBOUNCE:
+            return
+        _mail_last_queued[key] = now
+
+        if _mail_thread is None:
+            _mail_thread = threading.Thread(target=_mail_sender, name="mail-sender", daemon=True)
+            _mail_thread.start()
+            atexit.register(_drain_mail)
+    _MAIL_Q.put((subject, body))
+
+
+def _mail_sender():
+    logger = get_logger("mail")
+    while True:
+        subject, body = _MAIL_Q.get()
+        try:
+            # emailing pulls in pandas and dotenv; only pay for that when a
+            # notification is actually sent, not for every Job the CLI constructs.
+            from .emailing import send_mail_msg
+            send_mail_msg(body, subject)
+        except Exception as e:
+            logger.error(f"Error sending notification '{subject}': {e}")
+        finally:
+            _MAIL_Q.task_done()
+
+
+def _drain_mail(timeout=10):
+    # The sender is a daemon thread; give queued mail a chance to go out
+    # before the interpreter exits.
+    deadline = time.monotonic() + timeout
+    while _MAIL_Q.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+# "5 m", "30s", "1 hour" -> count and unit; only the unit's first letter counts.
+_FREQ_RE = re.compile(r"\s*(\d+)\s*([smh])", re.IGNORECASE)
+_FREQ_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+# "17:30", "5:30 pm"
+_TIME_RE = re.compile(r"\s*(\d{1,2}):(\d{1,2})\s*([ap]m)?\s*$", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=256)
+def freq_seconds(freq_str):
+    """Frequency string -> seconds, or None if it doesn't parse."""
+    m = _FREQ_RE.match(freq_str)
+    if m is None:
+        return None
+    return int(m.group(1)) * _FREQ_UNITS[m.group(2).lower()]
+
+
+@functools.lru_cache(maxsize=256)
+def clock_time(time_str):
+    """24h "HH:MM" or 12h "HH:MM am/pm" -> datetime.time, or None."""
+    m = _TIME_RE.match(time_str)
+    if m is None:
+        return None
+    hour, minute, meridiem = int(m.group(1)), int(m.group(2)), m.group(3)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.lower() == "pm" else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return dt_time(hour, minute)
+
+
+class Job:
+
+    # Status dirs already created by this process, so write_status only pays
+    # for makedirs on the first write to each.
+    _status_dirs_made = set()
     
     def __init__(self, schedule, config: Config):
         
@@ -20,7 +110,12 @@ class Job(ABC):
         self.name = schedule.get('name')
 
         # Status file path for recording PID, time started, and num_retries.
-        self.status_file = f"{config.status_dir}/{self.name}.json"
+        self.status_file = os.path.join(config.status_dir, f"{self.name}.json")
+        # (file identity, parsed dict) of the last status read or written.
+        self._status_cache = None
+        # Held around read-modify-write updates of the status file by callers
+        # that can run on more than one thread at once.
+        self._status_lock = threading.Lock()
         
         # Gets global logger setup earlier, or sets up if not yet done
         # self.pm_logger = logging.getLogger("process-manager")
@@ -29,61 +124,113 @@ class Job(ABC):
         self.job_logger = get_logger(self.name)
 
         # Log file for subprocess output
-        self.log_file = f"{config.log_dir}/{self.name}.log"
+        self.log_file = os.path.join(config.log_dir, f"{self.name}.log")
+        # Append fd for log_file, opened on first use (see log_fd()).
+        self._log_fd = None
+        self._log_fd_lock = threading.RLock()
+
+    def log_fd(self):
+        """
+        Return an O_APPEND fd for self.log_file, kept open for the life of
+        the job so each subprocess launch doesn't open/close the file.
+        Reopened if the file was deleted underneath it. Hold
+        self._log_fd_lock until the fd has been handed to Popen.
+        """
+        with self._log_fd_lock:
+            fd = self._log_fd
+            if fd is not None:
+                try:
+                    if os.fstat(fd).st_nlink:
+                        return fd
+                except OSError:
+                    pass
+                self.close_log_fd()
+            self._log_fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            return self._log_fd
+
+    def close_log_fd(self):
+        with self._log_fd_lock:
+            if self._log_fd is not None:
+                try:
+                    os.close(self._log_fd)
+                except OSError:
+                    pass
+                self._log_fd = None
 
 
     def parse_frequency(self, freq_str):
-        try:
-            value, unit = freq_str.split()
-            value = int(value)
-            if unit.lower().startswith('m'):
-                return value * 60
-            elif unit.lower().startswith('s'):
-                return value
-            elif unit.lower().startswith('h'):
-                return value * 3600
-        except Exception as e:
-            self.job_logger.error(f"Error parsing frequency '{freq_str}': {e}")
-        return 60  # default interval
+        seconds = freq_seconds(freq_str) if isinstance(freq_str, str) else None
+        if seconds is None:
+            self.job_logger.error(f"Error parsing frequency '{freq_str}'")
+            return 60  # default interval
+        return seconds
 
     def parse_time_str(self, time_str):
-        try:
-            return datetime.strptime(time_str, "%H:%M").time()
-        except ValueError:
-            try:
-                return datetime.strptime(time_str, "%I:%M %p").time()
-            except Exception as e:
-                self.job_logger.error(f"Error parsing time string '{time_str}': {e}")
-                return None
+        parsed = clock_time(time_str) if isinstance(time_str, str) else None
+        if parsed is None:
+            self.job_logger.error(f"Error parsing time string '{time_str}'")
+        return parsed
 
 
     def within_schedule(self):
-        if self.schedule_start is None or self.schedule_end is None:
+        start_s, end_s = self._schedule_start_s, self._schedule_end_s
+        if start_s is None or end_s is None:
             return True
-        now = datetime.now().time()
-        return self.schedule_start <= now <= self.schedule_end
+        lt = time.localtime()
+        return start_s <= lt.tm_hour * 3600 + lt.tm_min * 60 + lt.tm_sec <= end_s
 
 
     def write_status(self, status_dict):
+        # Write to a temp file and rename over the original so readers in the
+        # scheduler/CLI never see a half-written file. The pid suffix keeps
+        # the scheduler and a CLI process from sharing a temp file.
+        tmp_file = f"{self.status_file}.tmp.{os.getpid()}"
+        status_dir = os.path.dirname(self.status_file)
         try:
-            os.makedirs(os.path.dirname(self.status_file), exist_ok=True)
-            with open(self.status_file, "w") as f:
-                json.dump(status_dict, f)
+            if status_dir not in Job._status_dirs_made:
+                os.makedirs(status_dir, exist_ok=True)
+                Job._status_dirs_made.add(status_dir)
+            # Unbuffered: the whole status is one write() straight to the fd,
+            # with no BufferedWriter in between.
+            with open(tmp_file, "wb", buffering=0) as f:
+                f.write(json_dumps(status_dict))
+                # The rename keeps the inode, mtime and size, so this is the
+                # key read_status will see for the file we're about to publish.
+                key = self._stat_key(os.fstat(f.fileno()))
+            os.replace(tmp_file, self.status_file)
+            self._status_cache = (key, dict(status_dict))
         except Exception as e:
             self.job_logger.error(f"Error writing status file: {e}")
 
+    @staticmethod
+    def _stat_key(st):
+        # Every write replaces the file, so a new inode means new content even
+        # if mtime didn't tick.
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
     def read_status(self):
+        # Monitors read the status every tick but it rarely changes, so only
+        # re-parse when the file itself changed. Callers get a copy they can
+        # modify freely.
+        try:
+            key = self._stat_key(os.stat(self.status_file))
+            cached = self._status_cache
+            if cached is not None and cached[0] == key:
+                return dict(cached[1])
 
-        if not os.path.exists(self.status_file):
+            with open(self.status_file, "rb") as f:
+                status = json_loads(f.read())
+        except FileNotFoundError:
             return {}
-        
-        try:
-            with open(self.status_file, "r") as f:
-                return json.load(f)
         except Exception as e:
             self.job_logger.error(f"Error reading status file: {e}")
             return None
 
+        # If a writer replaced the file after the stat, the key is stale and
+        # the next call just reads again.
+        self._status_cache = (key, status)
+        return dict(status)
+
             
     def notify_down(self, additional_info=""):
         """
@@ -91,10 +238,10 @@ class Job(ABC):
         """
         subject = f"Script Down: {self.name}"
         body = f"The script '{self.name}' has died \
-            at {datetime.now().isoformat(sep=' ', timespec='seconds')}.\n"
+            at {timestamp()}.\n"
         if additional_info:
             body += f"\nAdditional Info: {additional_info}"
-        send_mail_msg(body, subject)
+        _queue_mail(body, subject)
 
     def notify_up(self, additional_info=""):
         """
@@ -102,10 +249,10 @@ class Job(ABC):
         """
         subject = f"Script Up: {self.name}"
         body = f"The script '{self.name}' is back up \
-            at {datetime.now().isoformat(sep=' ', timespec='seconds')}.\n"
+            at {timestamp()}.\n"
         if additional_info:
             body += f"\nAdditional Info: {additional_info}"
-        send_mail_msg(body, subject)        
+        _queue_mail(body, subject)        
 
     def notify_failure(self, additional_info=""):
         """
@@ -113,7 +260,7 @@ class Job(ABC):
         """
         subject = f"URGENT: Script {self.name} failed more than allowed times"
         body = f"The script '{self.name}' has failed {self.retries} times as of \
-            {datetime.now().isoformat(sep=' ', timespec='seconds')}.\nImmediate action is required."
+            {timestamp()}.\nImmediate action is required."
         if additional_info:
             body += f"\nAdditional Info: {additional_info}"
-        send_mail_msg(body, subject)
\ No newline at end of file
+        _queue_mail(body, subject)
\ No newline at end of file
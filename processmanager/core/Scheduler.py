@@ -1,17 +1,14 @@
 # scheduler.py
-import json
-import time
-import importlib
+import operator
 from .logger_setup import setup_pm_logging, get_logger
 from .BaseProgram import BaseProgram
 from .Task import Task
 from .utils import load_schedules
-from datetime import datetime
-import os
-import sys
+from .TimerQueue import TimerQueue
+import signal
 import threading
 import traceback
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from ..config import Config
 import logging
 
@@ -27,9 +24,11 @@ class Scheduler:
         self.sorted_task_queue = []
         self.task_dict = {}
         self.crashed = []
+        self.timer_queue = None
+        self._shutdown = threading.Event()
 
         # Probably don't need mark restart anymore, but I'll keep it since I prob don't need to remove
-        setup_pm_logging(config.log_dir, level=log_level, mark_restart=True)        
+        setup_pm_logging(config.log_dir, level=log_level, mark_restart=True, queued=True)
 
         self.pm_logger = get_logger("process-manager")
         
@@ -45,17 +44,14 @@ class Scheduler:
                 
                 if program_class_path:
                     try:
-                        module_name, class_name = program_class_path.rsplit('.', 1)
-                        module = importlib.import_module(module_name)
-                        cls = getattr(module, class_name)
-                        # Ensure the loaded class extends BaseProgram.
+                        # Registry hit for programs already imported; otherwise
+                        # imported once and checked to extend BaseProgram.
                         self.pm_logger.debug(f"Loading program class '{program_class_path}'")
-                        assert issubclass(cls, BaseProgram), f"{class_name} must extend BaseProgram"
+                        cls = BaseProgram.resolve(program_class_path)
                         self.programs.append(cls(job_sched, self.config))
 
                     except Exception as e:
-                        self.pm_logger.error(f"Error loading program class '{program_class_path}': {e}")
-                        self.pm_logger.error(traceback.format_exc())
+                        self.pm_logger.error(f"Error loading program class '{program_class_path}': {e}", exc_info=True)
                         
                 else:
                     self.pm_logger.error("No 'program_class' specified for a program job_sched")
@@ -65,18 +61,30 @@ class Scheduler:
                 self.tasks.append(task)
                 self.unsorted_task_queue.append(task)
 
-        # Sort tasks with start times.
-        start_time_tasks = [t for t in self.tasks if t.start_time_str]
+        # Sort tasks with start times. Every start is on the same date, so
+        # the (hour, minute) each Task parsed in __init__ orders them the
+        # same as today's start timestamps would.
+        start_time_tasks = [t for t in self.tasks if t.start_hm is not None]
         if start_time_tasks:
-            self.sorted_task_queue = sorted(
-                start_time_tasks,
-                key=lambda t: t.get_target_datetime(t.start_time_str, datetime.now().date()).timestamp()
-            )
+            self.sorted_task_queue = sorted(start_time_tasks, key=operator.attrgetter('start_hm'))
             
         else:
             self.sorted_task_queue = None
 
         self.task_dict = {task.name: task for task in self.tasks}
+
+        # Program monitor passes and task runs all wait on one timer thread.
+        # One worker per program means a slow monitor can't delay the others;
+        # the extra one covers task callbacks, which only launch the run.
+        self.timer_queue = TimerQueue(max_workers=len(self.programs) + 1, name="timers")
+
+        for task in self.tasks:
+            # Dependents are looked up here instead of re-reading the schedule file.
+            task.task_dict = self.task_dict
+            task.timer_queue = self.timer_queue
+        for prog in self.programs:
+            # Long-running under the scheduler, not a one-shot CLI check.
+            prog.persistent = True
         # Scheduler.instance = self
         self.pm_logger.info("Initialization complete with %d programs and %d tasks",
                           len(self.programs), len(self.tasks))
@@ -87,14 +95,26 @@ class Scheduler:
             for task in self.sorted_task_queue:
                 task.schedule()
 
+    def _safe_start(self, prog):
+        try:
+            self.pm_logger.info(f"Starting program '{prog.name}' on startup")
+            prog.start()
+        except Exception as e:
+            self.pm_logger.error(f"Error starting program '{prog.name}': {e}", exc_info=True)
+
     def safe_monitor(self, prog):
+        """Run one monitor pass for prog and queue the next one."""
         try:
-            prog.monitor()
+            delay = prog.monitor_tick()
         except Exception:
             # record the stack and which prog failed
             tb = traceback.format_exc()
             logging.error(f"[{prog.name}] monitor crashed:\n{tb}")
             self.crashed.append((prog, tb))
+            return
+
+        if delay is not None:
+            self.timer_queue.call_later(delay, self.safe_monitor, prog)
 
     def run(self):
 
@@ -102,27 +122,44 @@ class Scheduler:
         self.pm_logger.info("Scheduler starting")
         self.initialize()
 
-        # Start all programs.
+        # Start programs side by side; starts mostly wait on subprocesses and
+        # sockets, so startup takes as long as the slowest one, not the sum.
+        to_start = [prog for prog in self.programs
+                    if prog.run_on_start and prog.within_schedule()]
+        if to_start:
+            with ThreadPoolExecutor(max_workers=min(32, len(to_start)),
+                                    thread_name_prefix="start") as executor:
+                list(executor.map(self._safe_start, to_start))
+
+        # Instead of a sleeping thread per program, every monitor pass is
+        # queued on the timer queue. A program's next pass is only queued
+        # once its current one returns, so passes never overlap.
+        self.timer_queue.start()
         for prog in self.programs:
-            try:
-                if prog.run_on_start and prog.within_schedule():
-                    self.pm_logger.info(f"Starting program '{prog.name}' on startup")
-                    prog.start()
-
-            except Exception as e:
-                self.pm_logger.error(f"Error starting program '{prog.name}': {e}")
-                self.pm_logger.error(traceback.format_exc())
-
-
-        # Instead of blindly starting all programs, spawn a monitor thread for each.
-        for prog in self.programs:
-            t = threading.Thread(target=lambda p=prog: self.safe_monitor(p),
-                                name=f"monitor-{prog.name}", daemon=True)
-            t.start()
+            self.timer_queue.call_later(0, self.safe_monitor, prog)
 
         self.schedule_tasks()
+
+        # Monitors and tasks all run off the timer queue, so the main thread
+        # has nothing to do but block until asked to stop.
+        self._install_signal_handlers()
         try:
-            while True:
-                time.sleep(1)
+            self._shutdown.wait()
         except KeyboardInterrupt:
-            self.pm_logger.info("Scheduler shutting down")
+            pass
+        self.pm_logger.info("Scheduler shutting down")
+        self.timer_queue.stop()
+        for job in self.tasks + self.programs:
+            job.close_log_fd()
+
+    def shutdown(self, *_):
+        self._shutdown.set()
+
+    def _install_signal_handlers(self):
+        # Signal handlers can only be installed from the main thread.
+        if threading.current_thread() is not threading.main_thread():
+            return
+        # SIGTERM keeps its default: the executor's exit hook joins worker
+        # threads, so a monitor stuck on a hung mount or connect would stall
+        # the supervisor's stop until SIGKILL.
+        signal.signal(signal.SIGINT, self.shutdown)
@@ -1,13 +1,38 @@
-import sys
 import threading
 import subprocess
-import logging
 import math
-from pathlib import Path
-from datetime import datetime, timedelta
-from .utils import get_job_sched
+import time
+import functools
+from datetime import date, datetime, timedelta
+from .utils import get_job_sched, timestamp
 from ..config import Config
-from .Job import Job
+from .Job import Job, freq_seconds
+
+
+_DAY_NUMBERS = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_hm(time_str):
+    """
+    Convert a time string (e.g., '9:00 am', '5:30 pm pst') into an
+    (hour, minute) tuple. Raises ValueError/IndexError if it doesn't parse.
+    """
+    parts = time_str.lower().replace('pst', '').strip().split()
+    time_part = parts[0]
+    if ':' in time_part:
+        hour_str, minute_str = time_part.split(':')
+        hour = int(hour_str)
+        minute = int(minute_str)
+    else:
+        hour = int(time_part)
+        minute = 0
+    meridiem = parts[1]
+    if meridiem == 'pm' and hour != 12:
+        hour += 12
+    elif meridiem == 'am' and hour == 12:
+        hour = 0
+    return hour, minute
 
 
 class Task(Job):
@@ -30,74 +55,130 @@ class Task(Job):
         self.run_on_complete = schedule.get('run_on_complete', [])
         self.days = schedule.get('days', None)
 
+        # name -> Task for every task the scheduler loaded; set by
+        # Scheduler.initialize(). None when running outside the scheduler.
+        self.task_dict = None
+        # Shared timer queue for scheduled runs; also set by the scheduler.
+        self.timer_queue = None
+
+        # The schedule fields never change, so parse them once here instead
+        # of on every (re)schedule.
+        # Bit d set = weekday d allowed (0=Monday).
+        self._allowed_mask = sum(1 << d for d in set(self.get_allowed_days()))
+        if not self._allowed_mask:
+            self.job_logger.error(f"Task '{self.name}' has no valid days in {self.days}; it won't be scheduled.")
+        self._freq_seconds = self.parse_frequency(self.freq_str) if self.freq_str else None
+        self._start_hm = self._parse_hm_or_none(self.start_time_str)
+        self._stop_hm = self._parse_hm_or_none(self.stop_time_str)
+        # (date, start_ts, stop_ts) of the last window computed; reschedules
+        # within the same day reuse it.
+        self._window_cache = (None, None, None)
+
+
+    @property
+    def start_hm(self):
+        """(hour, minute) of the start time, or None if the task has none."""
+        return self._start_hm
 
     # Utility methods
+    def _parse_hm_or_none(self, time_str):
+        if not time_str:
+            return None
+        try:
+            return _parse_hm(time_str)
+        except (ValueError, IndexError) as e:
+            self.job_logger.error(f"Error parsing time string '{time_str}': {e}")
+            return None
+
     def get_target_datetime(self, time_str, date_obj):
         """
         Convert a time string (e.g., '9:00 am') into a datetime object on the given date.
         """
-        parts = time_str.lower().replace('pst', '').strip().split()
-        time_part = parts[0]
-        if ':' in time_part:
-            hour_str, minute_str = time_part.split(':')
-            hour = int(hour_str)
-            minute = int(minute_str)
-        else:
-            hour = int(time_part)
-            minute = 0
-        meridiem = parts[1]
-        if meridiem == 'pm' and hour != 12:
-            hour += 12
-        elif meridiem == 'am' and hour == 12:
-            hour = 0
-        return datetime.combine(date_obj, datetime.min.time()).replace(hour=hour, minute=minute, second=0, microsecond=0)
+        hour, minute = _parse_hm(time_str)
+        return datetime(date_obj.year, date_obj.month, date_obj.day, hour, minute)
 
     def parse_frequency(self, freq_str):
         """
         Parse a frequency string like '5m', '30s', or '1h' and return the frequency in seconds.
         """
-        try:
-            if freq_str.endswith('m'):
-                return int(freq_str[:-1]) * 60
-            elif freq_str.endswith('s'):
-                return int(freq_str[:-1])
-            elif freq_str.endswith('h'):
-                return int(freq_str[:-1]) * 3600
-        except Exception as e:
-            self.job_logger.error(f"Error parsing frequency '{freq_str}': {e}")
-        return None
+        seconds = freq_seconds(freq_str)
+        if seconds is None:
+            self.job_logger.error(f"Error parsing frequency '{freq_str}'")
+        return seconds
 
     def get_allowed_days(self):
         """
         Return a list of allowed weekdays (0=Monday, 6=Sunday) based on self.days.
         If no days are specified, all days are allowed.
         """
-        mapping = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
         if self.days:
-            return [mapping[d.lower()] for d in self.days if d.lower() in mapping]
+            return [_DAY_NUMBERS[d.lower()] for d in self.days if d.lower() in _DAY_NUMBERS]
         return list(range(7))
 
     def get_day_window(self, candidate_date):
         """
         Return the start and stop datetimes for a given candidate date based on the task's start and stop time strings.
         """
-        start_dt = self.get_target_datetime(self.start_time_str, candidate_date)
-        if self.stop_time_str:
-            stop_dt = self.get_target_datetime(self.stop_time_str, candidate_date)
+        # Build the datetimes directly rather than combine()/replace() from a
+        # midnight value.
+        y, mo, d = candidate_date.year, candidate_date.month, candidate_date.day
+        start_dt = datetime(y, mo, d, *self._start_hm)
+        if self._stop_hm:
+            stop_dt = datetime(y, mo, d, *self._stop_hm)
         else:
-            stop_dt = datetime.combine(candidate_date, datetime.min.time()).replace(hour=23, minute=59, second=59, microsecond=0)
+            stop_dt = datetime(y, mo, d, 23, 59, 59)
         return start_dt, stop_dt
 
     def get_next_allowed_date(self, current_date, days_ahead=1):
         """
         Return the next allowed date (as a date object) after current_date based on the allowed days.
         """
-        allowed_days = self.get_allowed_days()
-        while True:
-            next_date = current_date + timedelta(days=days_ahead)
-            if next_date.weekday() in allowed_days:
-                return next_date
-            days_ahead += 1
+        mask = self._allowed_mask
+        if not mask:
+            raise ValueError(f"Task '{self.name}' has no allowed days")
+        # Rotate the 7-bit weekday mask so bit 0 is the first candidate day;
+        # the lowest set bit is then the offset to the next allowed day.
+        start = (current_date.weekday() + days_ahead) % 7
+        rotated = ((mask >> start) | (mask << (7 - start))) & 0x7F
+        offset = (rotated & -rotated).bit_length() - 1
+        return current_date + timedelta(days=days_ahead + offset)
+
+    def _day_window_ts(self, candidate_date):
+        """Like get_day_window(), but as unix timestamps."""
+        cached_date, start_ts, stop_ts = self._window_cache
+        if cached_date != candidate_date:
+            start_dt, stop_dt = self.get_day_window(candidate_date)
+            start_ts, stop_ts = start_dt.timestamp(), stop_dt.timestamp()
+            self._window_cache = (candidate_date, start_ts, stop_ts)
+        return start_ts, stop_ts
+
+    def _compute_next_run(self, now):
+        """
+        Return the unix timestamp of the next run after `now` (also a unix
+        timestamp), snapped to the frequency grid of the day's window so runs
+        don't drift. Works only off the values parsed in __init__; datetimes
+        are built once per candidate day, the rest is float arithmetic.
+        """
+        candidate_date = date.fromtimestamp(now)
+        start_ts, stop_ts = self._day_window_ts(candidate_date)
+
+        # If today is not allowed or we've passed today's window, advance to next allowed date
+        if not self._allowed_mask >> candidate_date.weekday() & 1 or now >= stop_ts:
+            candidate_date = self.get_next_allowed_date(candidate_date, days_ahead=1)
+            start_ts, stop_ts = self._day_window_ts(candidate_date)
+
+        freq = self._freq_seconds
+        if freq and start_ts <= now < stop_ts:
+            # Floor + 1 targets the strictly next grid interval
+            next_run = start_ts + (math.floor((now - start_ts) / freq) + 1) * freq
+            if next_run <= stop_ts:
+                return next_run
+        elif now < start_ts:
+            return start_ts
+
+        # No frequency, past today's window, or the grid ran past stop_ts
+        candidate_date = self.get_next_allowed_date(candidate_date, days_ahead=1)
+        return self._day_window_ts(candidate_date)[0]
 
     def schedule(self):
         """
@@ -105,52 +186,38 @@ class Task(Job):
         frequency, and allowed days. When it's time, call run_threaded().
         """
         # Guard clause: Dependent tasks with no start time don't need scheduling logic
-        if not self.start_time_str:
+        # (an unparseable start time was already logged in __init__)
+        if self._start_hm is None:
             self.job_logger.debug(f"Task '{self.name}' has no start time; skipping automatic scheduling.")
             return
+        if not self._allowed_mask:
+            return
 
-        now = datetime.now()
-        candidate_date = now.date()
-        start_dt, stop_dt = self.get_day_window(candidate_date)
-
-        # If today is not allowed or we've passed today’s window, advance to next allowed date
-        if now.weekday() not in self.get_allowed_days() or now >= stop_dt:
-            candidate_date = self.get_next_allowed_date(now.date(), days_ahead=1)
-            start_dt, stop_dt = self.get_day_window(candidate_date)
-
-        freq_seconds = self.parse_frequency(self.freq_str) if self.freq_str else None
-
-        if freq_seconds and start_dt <= now < stop_dt:
-            elapsed = (now - start_dt).total_seconds()
-            
-            # --- FIX: Use floor + 1 here to match _schedule_next_run and prevent drift ---
-            n = math.floor(elapsed / freq_seconds) + 1
-            next_run = start_dt + timedelta(seconds=n * freq_seconds)
-            
-            if next_run > stop_dt:
-                candidate_date = self.get_next_allowed_date(candidate_date, days_ahead=1)
-                start_dt, stop_dt = self.get_day_window(candidate_date)
-                next_run = start_dt
-        elif now < start_dt:
-            next_run = start_dt
-        else:
-            # No frequency specified or current time >= stop time
-            candidate_date = self.get_next_allowed_date(candidate_date, days_ahead=1)
-            start_dt, stop_dt = self.get_day_window(candidate_date)
-            next_run = start_dt
+        now = time.time()
+        next_run = self._compute_next_run(now)
 
-        delay = (next_run - datetime.now()).total_seconds()
+        delay = next_run - now
         
         # Failsafe
         if delay < 0:
             delay = 1.0
             
         self.job_logger.info(
-            f"Scheduling task '{self.name}' to run in {delay:.0f} seconds (next run at {next_run})"
+            f"Scheduling task '{self.name}' to run in {delay:.0f} seconds (next run at {datetime.fromtimestamp(next_run)})"
         )
-        timer = threading.Timer(delay, self.run_threaded)
-        timer.daemon = True
-        timer.start()
+        self._call_later(delay, self.run_threaded)
+
+    def _call_later(self, delay, func):
+        """
+        Run func after delay seconds: on the scheduler's shared timer queue
+        when there is one, otherwise on a one-off Timer thread.
+        """
+        if self.timer_queue is not None:
+            self.timer_queue.call_later(delay, func)
+        else:
+            timer = threading.Timer(delay, func)
+            timer.daemon = True
+            timer.start()
 
     def run_threaded(self):
         """
@@ -162,44 +229,45 @@ class Task(Job):
             # 1) Build the subprocess command
             cmd = self.cmd
 
-            # 2) Open the log file in append mode
+            # 2) Launch the subprocess, appending stdout+stderr to the
+            #    task's long-lived log fd
+            self.job_logger.info(f"Starting subprocess for task '{self.name}': {cmd}")
             try:
-                log_fh = open(self.log_file, "a")
-            except Exception as e:
-                self.job_logger.error(f"Cannot open log file '{self.log_file}': {e}")
+                with self._log_fd_lock:
+                    proc = subprocess.Popen(
+                        cmd,
+                        stdout=self.log_fd(),
+                        stderr=subprocess.STDOUT,
+                    )
+            except OSError as e:
+                self.job_logger.error(f"Cannot launch task '{self.name}' (log file '{self.log_file}'): {e}")
                 return
 
-            # 3) Launch the subprocess, redirecting stdout+stderr → log_fh
-            self.job_logger.info(f"Starting subprocess for task '{self.name}': {cmd}")
-            proc = subprocess.Popen(
-                cmd,
-                stdout=log_fh,
-                stderr=subprocess.STDOUT,
-            )
-
             exit_code = None
             try:
-                # 4) Wait for it to finish
+                # 3) Wait for it to finish
                 exit_code = proc.wait()
             except Exception as e:
                 self.job_logger.error(f"Error while waiting for subprocess '{self.name}': {e}")
-            finally:
-                log_fh.close()
 
-            # 5) Update status based on exit code
-            status = self.read_status()
+            # 4) Update status based on exit code
             if exit_code == 0:
                 self.job_logger.info(f"Task '{self.name}' subprocess exited cleanly (code 0)")
-                status['last-ran'] = datetime.now().isoformat(sep=' ', timespec='seconds')
+                key = 'last-ran'
             else:
                 self.job_logger.error(
                     f"Task '{self.name}' subprocess exited with code {exit_code}"
                 )
-                status['last-err'] = datetime.now().isoformat(sep=' ', timespec='seconds')
+                key = 'last-err'
 
-            self.write_status(status)
+            # Overlapping runs of the same task finish on different threads;
+            # keep each read-modify-write whole so neither update is lost.
+            with self._status_lock:
+                status = self.read_status() or {}
+                status[key] = timestamp()
+                self.write_status(status)
 
-            # 6) Trigger any dependent tasks once completed
+            # 5) Trigger any dependent tasks once completed
             self._trigger_dependents()
 
         # Start the worker thread
@@ -207,7 +275,7 @@ class Task(Job):
         thread.daemon = True
         thread.start()
         
-        # 7) Now schedule the next run IMMEDIATELY and independently of how long the subprocess takes.
+        # 6) Now schedule the next run IMMEDIATELY and independently of how long the subprocess takes.
         # This prevents the scheduler from stalling if the subprocess hangs.
         self._schedule_next_run()
 
@@ -217,69 +285,33 @@ class Task(Job):
     def _schedule_next_run(self):
             """
             Calculates the next run datetime snapped to the frequency grid 
-            to prevent execution-time drift. Then starts a Timer.
+            to prevent execution-time drift. Then queues the run.
             """
             # Guard clause: Do not attempt to schedule next run if there is no start_time defined
-            if not self.start_time_str:
+            if self._start_hm is None or not self._allowed_mask:
                 return
 
-            now = datetime.now()
-            candidate_date = now.date()
-            start_dt, stop_dt = self.get_day_window(candidate_date)
+            now = time.time()
+            next_run = self._compute_next_run(now)
 
-            if self.freq_str:
-                freq_seconds = self.parse_frequency(self.freq_str)
-                
-                # Align the next run to the exact frequency grid relative to start_dt
-                if start_dt <= now < stop_dt:
-                    elapsed = (now - start_dt).total_seconds()
-                    
-                    # Floor + 1 ensures we always target the *strictly next* grid interval
-                    n = math.floor(elapsed / freq_seconds) + 1
-                    next_run = start_dt + timedelta(seconds=n * freq_seconds)
-                    
-                    # If the grid calculation pushes us past stop_dt, rollover to next day
-                    if next_run > stop_dt:
-                        candidate_date = self.get_next_allowed_date(candidate_date, days_ahead=1)
-                        start_dt, stop_dt = self.get_day_window(candidate_date)
-                        next_run = start_dt
-                        
-                else:
-                    # If we are past stop_dt (or before start_dt), find the next allowed start_dt
-                    if now >= stop_dt:
-                        candidate_date = self.get_next_allowed_date(candidate_date, days_ahead=1)
-                        start_dt, stop_dt = self.get_day_window(candidate_date)
-                    next_run = start_dt
-                    
-            else:
-                if now >= start_dt:
-                    candidate_date = self.get_next_allowed_date(candidate_date, days_ahead=1)
-                    start_dt, stop_dt = self.get_day_window(candidate_date)
-                next_run = start_dt
-
-            delay = (next_run - datetime.now()).total_seconds()
+            delay = next_run - now
             
             # Failsafe: if delay is somehow negative, run in 1 second
             if delay < 0:
                 delay = 1.0 
                 
             self.job_logger.debug(
-                f"Rescheduling task '{self.name}' to run again in {delay:.0f} seconds (next run at {next_run})"
+                f"Rescheduling task '{self.name}' to run again in {delay:.0f} seconds (next run at {datetime.fromtimestamp(next_run)})"
             )
-            timer = threading.Timer(delay, self.run_threaded)
-            timer.daemon = True
-            timer.start()
+            self._call_later(delay, self.run_threaded)
 
     def _trigger_dependents(self):
         for dep in self.run_on_complete:
             self.job_logger.debug(f"Task '{self.name}' completed, triggering '{dep}'")
-            
-            # This returns a raw dictionary from the JSON
-            dependent_config = get_job_sched(dep, "task", self.config.schedule_file)
 
-            if dependent_config:
-                dependent_task = Task(dependent_config, self.config)
+            dependent_task = self._find_task(dep)
 
+            if dependent_task:
                 if not dependent_task.start_time_str:
                     self.job_logger.debug(f"Dependent '{dep}' has no start time; running immediately.")
                     threading.Thread(target=dependent_task.run_threaded, daemon=True).start()
@@ -287,4 +319,18 @@ class Task(Job):
                     self.job_logger.debug(f"Dependent '{dep}' has a start time; scheduling it.")
                     dependent_task.schedule()
             else:
-                self.job_logger.error(f"Dependent task '{dep}' not found in scheduler.")
\ No newline at end of file
+                self.job_logger.error(f"Dependent task '{dep}' not found in scheduler.")
+
+    def _find_task(self, name):
+        """
+        Look up another task by name: the scheduler's loaded tasks when
+        available, otherwise its entry in the (cached) schedule file.
+        """
+        if self.task_dict is not None:
+            return self.task_dict.get(name)
+        try:
+            # This returns a raw dictionary from the JSON
+            dependent_config = get_job_sched(name, "task", self.config.schedule_file)
+        except ValueError:
+            return None
+        return Task(dependent_config, self.config)
@@ -0,0 +1,82 @@
+# timer_queue.py
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .logger_setup import get_logger
+
+
+class TimerQueue:
+
+    def __init__(self, max_workers=4, name="timer-queue"):
+
+        """
+        Runs callbacks at requested times from a single dispatcher thread.
+        Pending calls sit in a heap ordered by due time, so any number of
+        them costs one sleeping thread instead of one thread (or Timer) each.
+        Due callbacks are handed to a small thread pool so a slow one doesn't
+        hold up the rest. Times are time.monotonic() seconds.
+        """
+
+        self.name = name
+        self.logger = get_logger(name)
+
+        self._heap = []
+        self._seq = itertools.count()  # tie-breaker, keeps FIFO for equal times
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix=name)
+        self._thread = None
+        self._stopped = False
+
+    def call_at(self, when, func, *args):
+        """Run func(*args) once time.monotonic() reaches `when`."""
+        with self._cond:
+            seq = next(self._seq)
+            heapq.heappush(self._heap, (when, seq, func, args))
+            # Only wake the dispatcher if this is now the earliest call.
+            if self._heap[0][1] == seq:
+                self._cond.notify()
+
+    def call_later(self, delay, func, *args):
+        """Run func(*args) in `delay` seconds."""
+        self.call_at(time.monotonic() + delay, func, *args)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, wait=False):
+        """Stop dispatching. Pending calls are dropped; running ones finish."""
+        with self._cond:
+            self._stopped = True
+            self._heap.clear()
+            self._cond.notify()
+        self._executor.shutdown(wait=wait)
+
+    def _run(self):
+        with self._cond:
+            while not self._stopped:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                delay = self._heap[0][0] - time.monotonic()
+                if delay > 0:
+                    # Woken early by call_at()/stop(), or the timeout ran out;
+                    # either way re-check the head of the heap.
+                    self._cond.wait(delay)
+                    continue
+
+                _, _, func, args = heapq.heappop(self._heap)
+                self._executor.submit(self._call, func, args)
+
+    def _call(self, func, args):
+        try:
+            func(*args)
+        except Exception:
+            self.logger.exception(f"Callback {func!r} raised")
@@ -1,44 +1,69 @@
 import os
 import sys
+import queue
+import atexit
 import logging
 from logging import FileHandler
+from logging.handlers import QueueHandler, QueueListener
 from ..config import Config
 
 class TruncatingFileHandler(FileHandler):
     """
     A custom logging handler that writes log records to a single file.
-    When the file exceeds maxBytes (10 MB by default), it truncates the beginning of the file,
-    preserving only the most recent data up to maxBytes.
+    When the file grows past twice maxBytes (10 MB by default), it truncates the beginning of the file,
+    preserving only the most recent data up to maxBytes. Growth is tracked with an in-memory count
+    of what this handler wrote, so the file is only stat'ed when a trim looks due.
     """
     def __init__(self, filename, mode='a', maxBytes=10 * 1024 * 1024, encoding=None, delay=False):
         self.maxBytes = maxBytes
         super().__init__(filename, mode, encoding, delay)
+        try:
+            self._bytes_written = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._bytes_written = 0
     
     def emit(self, record):
         try:
-            super().emit(record)
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            self.stream.write(msg)
             self.flush()
-            self._truncate_if_needed()
+            # Characters, not bytes, but close enough to decide when to look
+            # at the real size.
+            self._bytes_written += len(msg)
+            if self._bytes_written > 2 * self.maxBytes:
+                self._truncate_if_needed()
         except Exception:
             self.handleError(record)
     
     def _truncate_if_needed(self):
         try:
-            # Check if file exceeds maxBytes
-            if os.path.getsize(self.baseFilename) > self.maxBytes:
-                with open(self.baseFilename, 'rb') as f:
-                    # Seek to the position where the last maxBytes starts.
-                    f.seek(-self.maxBytes, os.SEEK_END)
-                    data = f.read()
-                # Write the last maxBytes back to the file.
-                with open(self.baseFilename, 'wb') as f:
-                    f.write(data)
-                # Reopen the stream to update the file handle.
-                if self.stream:
-                    self.stream.close()
-                self.stream = self._open()
+            fd = os.open(self.baseFilename, os.O_RDWR)
+        except OSError as e:
+            self.handleError(e)
+            return
+        try:
+            size = os.fstat(fd).st_size
+            # Resync with the real size; other processes may share the file.
+            self._bytes_written = size
+            if size <= 2 * self.maxBytes:
+                return
+            # Move the last maxBytes to the front and cut the file there. The
+            # stream is in append mode, so its next write lands at the new end
+            # and it doesn't need reopening.
+            data = os.pread(fd, self.maxBytes, size - self.maxBytes)
+            # Start on a line boundary rather than mid-record.
+            newline = data.find(b"\n")
+            if 0 <= newline < len(data) - 1:
+                data = data[newline + 1:]
+            os.pwrite(fd, data, 0)
+            os.ftruncate(fd, len(data))
+            self._bytes_written = len(data)
         except Exception as e:
             self.handleError(e)
+        finally:
+            os.close(fd)
 
 """
 if name == main:
@@ -55,16 +80,25 @@ elsewhere in code:
     
 """            
 
-def setup_pm_logging(log_dir, level=logging.DEBUG, mark_restart=False):
+# Background listener writing queued records, when setup asked for one.
+_LISTENER = None
+
+def setup_pm_logging(log_dir, level=logging.DEBUG, mark_restart=False, queued=False):
     
     pm_log_file = f"{log_dir}/process-manager.log"
-    setup_base_logging(pm_log_file, level=level, mark_restart=mark_restart)
+    setup_base_logging(pm_log_file, level=level, mark_restart=mark_restart, queued=queued)
 
-def setup_base_logging(log_file, level=logging.DEBUG, mark_restart=False):
+def setup_base_logging(log_file, level=logging.DEBUG, mark_restart=False, queued=False):
     """
     Sets up the root logger to write to a shared file and stdout.
     All named loggers will inherit from this.
+    With queued=True the root logger only gets a QueueHandler, and a background
+    QueueListener does the file/console writes, so logging calls in monitor and
+    task threads never wait on disk. Meant for the long-running scheduler; the
+    CLI keeps writing directly so its log lines stay in order with its output.
     """
+    global _LISTENER
+
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
 
@@ -72,7 +106,6 @@ def setup_base_logging(log_file, level=logging.DEBUG, mark_restart=False):
         "ib_insync": logging.WARNING,
         "matplotlib": logging.INFO,
         "urllib3": logging.ERROR,
-        "asyncio": logging.WARNING
     }
 
     for lib_name, lib_level in noisy_libs.items():
@@ -95,13 +128,23 @@ def setup_base_logging(log_file, level=logging.DEBUG, mark_restart=False):
         file_handler = TruncatingFileHandler(log_file, maxBytes=256 * 1024)
         file_handler.setFormatter(formatter)
         file_handler.setLevel(level)
-        root_logger.addHandler(file_handler)
 
         # Stream handler (console)
         stream_handler = logging.StreamHandler(sys.stdout)
         stream_handler.setFormatter(formatter)
         stream_handler.setLevel(level)
-        root_logger.addHandler(stream_handler)
+
+        if queued:
+            log_queue = queue.SimpleQueue()
+            root_logger.addHandler(QueueHandler(log_queue))
+            _LISTENER = QueueListener(log_queue, file_handler, stream_handler,
+                                      respect_handler_level=True)
+            _LISTENER.start()
+            # Flush whatever is still queued on the way out.
+            atexit.register(_LISTENER.stop)
+        else:
+            root_logger.addHandler(file_handler)
+            root_logger.addHandler(stream_handler)
 
 def get_logger(name, level=logging.DEBUG):
     """
@@ -1,56 +1,113 @@
 import importlib
+import functools
 from datetime import datetime
-import subprocess
 import json
 import hashlib
 import os
+import signal
+import sys
+import time
 from .logger_setup import get_logger
 from pathlib import Path
 
+# orjson is optional; it parses/serialises the small status and schedule
+# files several times faster than the stdlib. Both helpers work on bytes.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
 # logger = logging.getLogger(__name__)
 
 
 def load_json(filename):
-    with open(filename, 'r') as f:
-        return json.load(f)
+    with open(filename, 'rb') as f:
+        return json_loads(f.read())
 
         
 def get_job_sched(job_name, type, schedule_file: Path) -> dict:
 
-    schedules, _ = load_schedules(schedule_file)
+    try:
+        _, index = _cached_schedules(schedule_file)
+    except Exception as e:
+        get_logger("utils").error(f"Error loading schedules: {e}")
+        index = {}
 
-    job_sched = None
-    for schedule in schedules:
-        if schedule.get("type") == type and schedule.get("name") == job_name:
-            job_sched = schedule 
-            break
-    if not job_sched:
-        raise ValueError(f"No schedule found for program '{job_name}'")
+    job_sched = index.get((type, job_name))
+    if job_sched is None:
+        raise ValueError(f"No schedule found for {type} '{job_name}'")
     
     return job_sched
 
         
+@functools.lru_cache(maxsize=8)
+def _parse_schedules(schedule_file, mtime_ns, size):
+    """
+    Parse the schedule file. Cached on the file's mtime and size, so repeated
+    loads within a process only cost a stat() until the file is edited. The
+    returned list is shared between callers; treat it as read-only.
+    Returns (schedules, index).
+    """
+    with open(schedule_file, 'rb') as f:
+        data = json_loads(f.read())
+
+    # Intern the keys so .get("type") etc. with the (already interned) code
+    # literals matches on identity instead of comparing strings.
+    schedules = [{sys.intern(k): v for k, v in schedule.items()}
+                 for schedule in data.get('schedules', [])]
+
+    # (type, name) -> schedule, so get_job_sched is a dict lookup. The first
+    # entry wins on duplicates, same as the old linear scan.
+    index = {}
+    for schedule in schedules:
+        index.setdefault((schedule.get("type"), schedule.get("name")), schedule)
+
+    return schedules, index
+
+
+@functools.lru_cache(maxsize=8)
+def _schedules_digest(schedule_file, mtime_ns, size):
+    """
+    SHA-256 of the schedule file's bytes, cached like _parse_schedules. Kept
+    separate so get_job_sched never pays for it; the hash only detects edits
+    to the file, so the raw bytes are hashed rather than the parsed form.
+    """
+    with open(schedule_file, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _schedule_key(schedule_file):
+    """Cache key for the schedule file: (path, mtime_ns, size)."""
+    st = os.stat(schedule_file)
+    return os.fspath(schedule_file), st.st_mtime_ns, st.st_size
+
+
+def _cached_schedules(schedule_file):
+    return _parse_schedules(*_schedule_key(schedule_file))
+
+
 def load_schedules(schedule_file: Path, write_hash=False):
-    """Load schedules, validate or write a hash, and return (schedules, valid_hash)."""
+    """
+    Load schedules, validate or write a hash, and return (schedules, valid_hash).
+    """
     # logger.debug("Loading schedules")
     
     logger = get_logger("utils")
 
     try:
-        with open(schedule_file, 'r') as f:
-            data = json.load(f)
+        key = _schedule_key(schedule_file)
+        schedules, _ = _parse_schedules(*key)
+        digest = _schedules_digest(*key)
     except Exception as e:
         logger.error(f"Error loading schedules: {e}")
         return [], False
 
-    schedules = data.get('schedules', [])
-
-    # 1. Serialize in a stable way
-    canonical = json.dumps(schedules, sort_keys=True, separators=(',', ':'))
-
-    # 2. Compute SHA-256 hash
-    digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
-
     # 3. Determine hash file path
     base, _ext = os.path.splitext(os.path.basename(schedule_file))
     hash_filename = f"{base}.hash"
@@ -67,8 +124,8 @@ def load_schedules(schedule_file: Path, write_hash=False):
 
     valid_hash = (old_digest == digest) if old_digest is not None else False
 
-    # 5. Optionally write out the new hash
-    if write_hash:
+    # 5. Optionally write out the new hash, only if it changed
+    if write_hash and not valid_hash:
         try:
             with open(hash_path, 'w') as hf:
                 hf.write(digest)
@@ -78,16 +135,126 @@ def load_schedules(schedule_file: Path, write_hash=False):
 
     return schedules, valid_hash
 
+
+
+def load_all_statuses(status_dir):
+    """
+    Read every <name>.json status file in status_dir in one directory pass.
+    Returns {name: status_dict}; a missing directory gives {} and files that
+    can't be read or parsed are logged and left out.
+    """
+    statuses = {}
+    try:
+        entries = os.scandir(status_dir)
+    except FileNotFoundError:
+        return statuses
+
+    with entries:
+        for entry in entries:
+            # Skips the ".json.tmp.<pid>" files from in-flight writes too.
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path, 'rb') as f:
+                    statuses[entry.name[:-5]] = json_loads(f.read())
+            except Exception as e:
+                get_logger("utils").error(f"Error reading status file {entry.path}: {e}")
+
+    return statuses
+
     
     
+@functools.lru_cache(maxsize=None)
+def resolve_class(class_path):
+    """
+    Resolve "package.module.ClassName" to the class object. Cached per path,
+    so programs sharing a class and repeated CLI calls skip the import
+    machinery and attribute lookups.
+    """
+    mod_name, cls_name = class_path.rsplit(".", 1)
+    module = sys.modules.get(mod_name)
+    if module is None:
+        module = importlib.import_module(mod_name)
+    return getattr(module, cls_name)
+
+
+@functools.lru_cache(maxsize=None)
+def short_class_path(class_path):
+    """"package.module.ClassName" -> "module.ClassName" for display."""
+    mod_name, cls_name = class_path.rsplit(".", 1)
+    return f"{mod_name.rsplit('.', 1)[-1]}.{cls_name}"
+
+
 def dynamic_import(func_path):
     """
     Dynamically import a function from a module.
     For example, given "path.to.module.func_name", it returns the function object.
+    Shares resolve_class's per-path cache.
+    """
+    return resolve_class(func_path)
+
+def _cell(value):
+    # tabulate rendered missing values as blanks; keep that behaviour.
+    return "" if value is None else str(value)
+
+
+def _is_number(value):
+    # Same test tabulate used to pick a column's type: bools are not
+    # numbers, numeric strings are.
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    if isinstance(value, str):
+        try:
+            float(value)
+        except ValueError:
+            return False
+        return True
+    return False
+
+
+def render_table(rows, headers=None):
+    """
+    Render rows in the same box-drawing style as tabulate's "rounded_outline"
+    and return it as one string. Pass no headers for a table without a
+    header row. Columns whose non-blank cells are all numbers are
+    right-aligned, as tabulate did; everything else is left-aligned.
     """
-    module_path, func_name = func_path.rsplit('.', 1)
-    module = importlib.import_module(module_path)
-    return getattr(module, func_name)
+    numeric = [all(_is_number(c) for c in col if c is not None and c != "")
+               and any(c is not None and c != "" for c in col)
+               for col in zip(*rows)]
+    # Stringify every cell once; widths and padding both reuse it.
+    rows = [[_cell(c) for c in row] for row in rows]
+    columns = zip(headers, *rows) if headers else zip(*rows)
+    widths = [max(map(len, col)) for col in columns]
+    if not numeric:
+        numeric = [False] * len(widths)
+    bars = ["─" * (w + 2) for w in widths]
+
+    def border(left, mid, right):
+        return left + mid.join(bars) + right
+
+    def line(row):
+        return "│ " + " │ ".join(c.rjust(w) if num else c.ljust(w)
+                                 for c, w, num in zip(row, widths, numeric)) + " │"
+
+    out = [border("╭", "┬", "╮")]
+    if headers:
+        out.append(line(headers))
+        out.append(border("├", "┼", "┤"))
+    out.extend(line(row) for row in rows)
+    out.append(border("╰", "┴", "╯"))
+    return "\n".join(out)
+
+
+def timestamp(ts=None):
+    """
+    Local time as "YYYY-MM-DD HH:MM:SS", the format written to status files.
+    Same output as datetime.now().isoformat(sep=' ', timespec='seconds')
+    without building a datetime object.
+    """
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
 
 def check_ib_valid_time():
     """
@@ -99,24 +266,49 @@ def check_ib_valid_time():
     current_time = datetime.now().time()
     return start_time >= current_time or current_time >= end_time
 
-def list_and_kill_process(process_name):
+def _iter_proc_comms():
+    """
+    Yield (pid, comm) for every process in /proc. comm is the same
+    (15-char truncated) name `ps -o comm` prints. Processes that exit
+    mid-scan are skipped.
+    """
+    with os.scandir('/proc') as it:
+        for entry in it:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry.name}/comm", 'rb') as f:
+                    comm = f.read().rstrip(b"\n").decode(errors='replace')
+            except OSError:
+                continue
+            yield int(entry.name), comm
+
+
+def list_and_kill_process(*process_names):
     """
-    Lists running processes and kills any process matching the given name.
+    Lists running processes and kills any process matching the given name(s).
+    Several names are handled in one pass over the process table.
     """
     logger = get_logger("utils")
 
+    pending = set(process_names)
     try:
-        result = subprocess.run(['ps', '-e', '-o', 'pid,comm'], stdout=subprocess.PIPE, text=True)
-        processes = result.stdout.splitlines()
-        for line in processes:
-            parts = line.split(None, 1)
-            if len(parts) == 2:
-                pid, command = parts
-                if command == process_name:
-                    logger.debug(f"Found process '{process_name}' with PID {pid}. Killing it...")
-                    subprocess.run(['kill', '-9', pid])
-                    logger.debug(f"Process '{process_name}' with PID {pid} has been killed.")
-                    return
-        logger.debug(f"Process '{process_name}' is not running.")
+        # Walk /proc and signal directly instead of forking ps and kill.
+        for pid, command in _iter_proc_comms():
+            if command not in pending:
+                continue
+            logger.debug(f"Found process '{command}' with PID {pid}. Killing it...")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                continue
+            logger.debug(f"Process '{command}' with PID {pid} has been killed.")
+            # Like before, only the first match for each name is killed.
+            pending.discard(command)
+            if not pending:
+                return
+        for process_name in process_names:
+            if process_name in pending:
+                logger.debug(f"Process '{process_name}' is not running.")
     except Exception as e:
         logger.error(f"An error occurred: {e}")
@@ -1,8 +1,7 @@
 # mongo_program.py
 from ..core.BaseProgram import BaseProgram
 import subprocess
-import os
-from sysdata.data_blob import dataBlob  # Assumes dataBlob provides a mongo_db() method
+import pymongo
 from pymongo import MongoClient, errors
 import shutil
 from ..config import Config
@@ -13,27 +12,34 @@ class MongoProgram(BaseProgram):
         # Use the inherited status_file or one from config.
         # Set the monitor function to our custom monitor.
         self.monitor_func = self.custom_monitor
+        # mongod is started locally on its default port; override per schedule if needed.
+        self.mongo_uri = schedule.get('mongo_uri', 'mongodb://localhost:27017')
+        # Built on the first check and reused, so each check is one ping
+        # rather than a new client, DNS lookup and server selection.
+        self._mongo_client = None
 
     @BaseProgram.record_start
     def start(self):
         """
-        Starts the Mongo process using the command:
-        bash -c "source $HOME/.profile; mongod --dbpath $MONGO_DATA"
+        Starts the Mongo process: mongod --dbpath <mongo_data>, run directly
+        (no shell), with output appended to the log file.
         Returns the spawned process's PID.
         """
         mongo_data = "/home/kyle/data/mongodb/"
         mongod_path = shutil.which("mongod") or "/usr/bin/mongod"  # Adjust if needed
 
-        cmd = f"{mongod_path} --dbpath \"{mongo_data}\""
-        self.job_logger.debug(f"Launching Mongo with command: {cmd}")
+        cmd = [mongod_path, "--dbpath", mongo_data]
+        self.job_logger.debug(f"Launching Mongo with command: {' '.join(cmd)}")
 
         try:
-            self.process = subprocess.Popen(
-                ["bash", "-c", cmd],
-                stdout=open(self.log_file, "a"),
-                stderr=subprocess.STDOUT,
-                preexec_fn=os.setsid
-            )
+            # The job's long-lived append fd, not a new open() per start.
+            with self._log_fd_lock:
+                self.process = subprocess.Popen(
+                    cmd,
+                    stdout=self.log_fd(),
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True
+                )
             self.job_logger.info(f"Started Mongo Program '{self.name}' with PID {self.process.pid}")
             return self.process.pid
         except Exception as e:
@@ -53,19 +59,40 @@ class MongoProgram(BaseProgram):
             except Exception as e:
                 self.job_logger.error(f"Error stopping Mongo Program '{self.name}': {e}")
 
+    def _client(self):
+        if self._mongo_client is None:
+            self._mongo_client = MongoClient(
+                self.mongo_uri,
+                serverSelectionTimeoutMS=1500,
+                connectTimeoutMS=1500,
+                socketTimeoutMS=2000,
+                maxPoolSize=2,
+                minPoolSize=1,
+                appname="pm-monitor",
+            )
+        return self._mongo_client
+
+    def _reset_client(self):
+        if self._mongo_client is not None:
+            self._mongo_client.close()
+            self._mongo_client = None
+
     def custom_monitor(self):
         """
         Custom monitoring function for the Mongo process.
-        It calls dataBlob().mongo_db() to check if a connection to the Mongo server can be made.
-        If an exception is raised, the monitor attempts to restart the process.
+        Pings the server over a cached client to check that it is reachable.
+        If the ping fails, the monitor attempts to restart the process.
         """
         try:
-            d = dataBlob()
-            # mongo_db() should throw an exception if the connection fails.
-            client = d.mongo_db.client
-            client.admin.command('ping')
+            # Caps the whole ping, not just server selection, so a hung
+            # mongod can't hold the monitor for pymongo's 30s default.
+            with pymongo.timeout(1.5):
+                self._client().admin.command('ping')
             self.job_logger.debug("Mongo monitor check succeeded.")
             return "SUCCESS"
-        except errors.ServerSelectionTimeoutError as e:
+        except errors.PyMongoError as e:
             self.job_logger.error(f"Mongo monitor check failed: {e}")
+            if isinstance(e, errors.AutoReconnect):
+                # Covers ServerSelectionTimeoutError; rebuild the client next time.
+                self._reset_client()
             return "RESTART"
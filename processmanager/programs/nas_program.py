@@ -2,6 +2,7 @@
 from ..core.BaseProgram import BaseProgram
 import subprocess
 import os
+import socket
 from ..config import Config
 
 class NASProgram(BaseProgram):
@@ -14,7 +15,7 @@ class NASProgram(BaseProgram):
     def start(self):
         """
         Starts the NAS mounting process.
-        It first pings readynas.local to trigger DNS resolution,
+        It first connects to readynas.local's NFS port to trigger DNS resolution,
         then mounts the NFS share from readynas.local:/data/market_data to /mnt/nas.
         Returns the PID of the mounting process.
         """
@@ -22,27 +23,27 @@ class NASProgram(BaseProgram):
 
         self.job_logger.debug(f"Starting NAS Program: {self.name}")
         try:
-            # Step 1: Check if readynas.local resolves and is reachable
-            ping_command = ["ping", "-c", "1", "-W", "3", "readynas.local"]  # -W is timeout in seconds (Linux)
-            ping_result = subprocess.run(ping_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-            if ping_result.returncode != 0:
-                self.job_logger.error(f"NAS ping failed: {ping_result.stderr.decode().strip()}")
+            # Step 1: Check if readynas.local resolves and its NFS port is
+            # reachable (a TCP connect, no ping subprocess)
+            try:
+                with socket.create_connection(("readynas.local", 2049), timeout=3):
+                    pass
+            except OSError as e:
+                self.job_logger.error(f"NAS reachability check failed: {e}")
                 return None
 
             # Step 2: Mount in a detached process
-            self.process = subprocess.Popen(
-                ["mount", "/mnt/nas"],  # Use sudo if needed and configured with NOPASSWD
-                stdout=open(self.log_file, "a"),
-                stderr=subprocess.STDOUT,
-                preexec_fn=os.setsid
-            )
+            # The job's long-lived append fd, not a new open() per start.
+            with self._log_fd_lock:
+                self.process = subprocess.Popen(
+                    ["mount", "/mnt/nas"],  # Use sudo if needed and configured with NOPASSWD
+                    stdout=self.log_fd(),
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True
+                )
             self.job_logger.info(f"Started NAS Program '{self.name}' with PID {self.process.pid}")
             return self.process.pid
 
-        except subprocess.TimeoutExpired:
-            self.job_logger.error("Ping to NAS timed out.")
-            return None
         except Exception as e:
             self.job_logger.error(f"Failed to start NAS Program '{self.name}': {e}")
             return None
@@ -57,14 +58,20 @@ class NASProgram(BaseProgram):
     def custom_monitor(self):
         """
         Custom monitoring function for the NAS mount.
-        Lists the contents of /mnt/nas and checks that there are at least two directories.
+        Checks that /mnt/nas is a mount point and that it has at least two directories.
         If fewer than two directories are found, it attempts to re-mount by calling start().
         Returns True if a restart was triggered, False otherwise.
         """
         try:
-            items = os.listdir("/mnt/nas")
-            # Filter to include only directories.
-            dirs = [item for item in items if os.path.isdir(os.path.join("/mnt/nas", item))]
+            # An unmounted /mnt/nas is just an empty (or local) directory;
+            # catch that without listing it.
+            if not os.path.ismount("/mnt/nas"):
+                self.job_logger.warning("NAS mount check failed: /mnt/nas is not mounted. Attempting restart.")
+                return "RESTART"
+            # scandir's d_type answers is_dir() without a stat() per entry
+            # (over NFS each of those is a round trip).
+            with os.scandir("/mnt/nas") as it:
+                dirs = [entry.name for entry in it if entry.is_dir()]
             self.job_logger.debug(f"NASProgram.custom_monitor: Directories found in /mnt/nas: {dirs}")
             if len(dirs) < 2:
                 self.job_logger.warning("NAS mount check failed: fewer than 2 directories found. Attempting restart.")
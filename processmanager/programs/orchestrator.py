@@ -2,7 +2,6 @@
 from ..core.BaseProgram import BaseProgram
 import subprocess
 import os
-import time
 import signal
 from ..config import Config
 
@@ -37,20 +36,16 @@ class OrchestratorProgram(BaseProgram):
             python_executable = "/home/kyle/anaconda3/envs/futures_env/bin/python"
             script_path = "/home/kyle/projects/FuturesSystem/src/futures_system/price_pipeline/orchestrator.py"
 
-            # Construct the shell command.
-            # 'exec' replaces the shell process with the python process.
-            # '>>' appends stdout and '2>&1' redirects stderr to stdout.
-            command = (
-                f"exec {python_executable} {script_path} "
-                f">> {self.log_file} 2>&1"
-            )
-
-            # Use Popen to run the command in a new, detached process session.
-            # This prevents it from being killed if the parent script exits.
-            self.process = subprocess.Popen(
-                ["bash", "-c", command],
-                preexec_fn=os.setsid
-            )
+            # Run the interpreter directly (no shell) in a new session, so it
+            # isn't killed if the parent script exits, appending stdout and
+            # stderr to the job's log fd.
+            with self._log_fd_lock:
+                self.process = subprocess.Popen(
+                    [python_executable, script_path],
+                    stdout=self.log_fd(),
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True
+                )
             self.job_logger.info(f"Started Orchestrator Program '{self.name}' with PID {self.process.pid}")
             return self.process.pid
         except Exception as e:
@@ -68,7 +63,7 @@ class OrchestratorProgram(BaseProgram):
         self.job_logger.debug(f"Stopping Orchestrator Program: {self.name}")
 
         # Use the default monitor to check if the process is running
-        if not self.default_monitor():
+        if self.default_monitor() != "SUCCESS":
             self.job_logger.warning(f"Orchestrator Program '{self.name}' was not running.")
             return
 
@@ -85,11 +80,11 @@ class OrchestratorProgram(BaseProgram):
             self.job_logger.info(f"Sending SIGINT to process group {pgid} for orchestrator '{self.name}'...")
             os.killpg(pgid, signal.SIGINT)
 
-            # Wait for a moment to allow for graceful exit
-            time.sleep(5)
+            # Give it up to 5s to exit gracefully, returning as soon as it does
+            exited = self.wait_for_exit(pid, timeout=5)
 
-            # 2. Check if it's still running and force stop if necessary
-            if self.default_monitor():
+            # 2. Force stop if it's still running
+            if not exited:
                 self.job_logger.warning(f"Orchestrator '{self.name}' did not terminate with SIGINT. Sending SIGKILL...")
                 os.killpg(pgid, signal.SIGKILL)
                 self.job_logger.info(f"Orchestrator '{self.name}' terminated with SIGKILL.")
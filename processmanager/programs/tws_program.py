@@ -2,16 +2,39 @@
 from ..core.BaseProgram import BaseProgram
 from ..core.utils import check_ib_valid_time, list_and_kill_process
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import logging
 import os
 import subprocess
+import threading
 from ..config import Config
 
+# The IB monitor thread is the only place an asyncio loop runs (ib_insync),
+# so its logger is quieted here rather than in the shared logging setup.
+logging.getLogger("asyncio").setLevel(logging.WARNING)
+
+
+def _init_ib_thread():
+    # ib_insync drives its connection from the calling thread's event loop.
+    import asyncio
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
 class TWS_Program(BaseProgram):
     def __init__(self, schedule, config: Config):
         super().__init__(schedule, config)
         # Override the monitor function with a custom one.
         self.monitor_func = self.custom_monitor
         self.is_down = True
+        # Under the scheduler, one IB connection is kept across monitor checks
+        # instead of a connect, handshake and disconnect every tick. An IB object belongs to the
+        # event loop it connected on, so all IB calls go through a single
+        # thread, and the connection lives in that thread's locals.
+        self._ib_local = threading.local()
+        self._ib_executor = self._new_ib_executor()
+        # Connect, round trip and first account summary are each bounded by
+        # ib_timeout; don't wait on the IB thread longer than all three.
+        self._ib_wait = 3 * getattr(self.config, "ib_timeout", 5)
 
     @BaseProgram.record_start
     def start(self):
@@ -20,8 +43,7 @@ class TWS_Program(BaseProgram):
             self.job_logger.info("Current time is not valid for starting TWS.")
             return
 
-        list_and_kill_process("ibcstart.sh")
-        list_and_kill_process("xterm")
+        list_and_kill_process("ibcstart.sh", "xterm")
 
         try:
             env = os.environ.copy()
@@ -33,13 +55,16 @@ class TWS_Program(BaseProgram):
             # Make sure conda + ibc are on PATH if needed
             env["PATH"] = "/home/kyle/miniconda3/condabin:/home/kyle/miniconda3/bin:" + env.get("PATH", "")
 
-            command = f"nohup /opt/ibc/twsstart.sh >> {self.log_file} 2>&1 &"
-
-            self.process = subprocess.Popen(
-                ["bash", "-lc", command],  # -l can help pick up /etc/profile; optional
-                preexec_fn=os.setsid,
-                env=env,
-            )
+            # Run the script directly: the new session already detaches it
+            # (no nohup/&), and output goes to the job's append fd.
+            with self._log_fd_lock:
+                self.process = subprocess.Popen(
+                    ["/opt/ibc/twsstart.sh"],
+                    stdout=self.log_fd(),
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True,
+                    env=env,
+                )
             self.job_logger.info(f"Started TWS program '{self.name}' with PID {self.process.pid}")
             return self.process.pid
 
@@ -57,48 +82,102 @@ class TWS_Program(BaseProgram):
         try:
             if self.process:
                 self.process.terminate()
-            list_and_kill_process("ibcstart.sh")
-            list_and_kill_process("xterm")
+            list_and_kill_process("ibcstart.sh", "xterm")
             
             self.job_logger.info(f"TWS program '{self.name}' terminated.")
         except Exception as e:
             self.job_logger.error(f"Error stopping TWS program '{self.name}': {e}")
 
-    def custom_monitor(self):
-        import asyncio
+    @staticmethod
+    def _new_ib_executor():
+        return ThreadPoolExecutor(max_workers=1,
+                                  thread_name_prefix="tws-monitor",
+                                  initializer=_init_ib_thread)
 
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
+    def _reset_ib_executor(self):
+        """
+        Abandon an IB thread stuck past _ib_wait. It can't be interrupted,
+        so queue a disconnect behind the stuck call (freeing the client id
+        once it returns) and send later checks to a fresh thread.
+        """
+        old = self._ib_executor
+        self._ib_executor = self._new_ib_executor()
+        old.submit(self._disconnect_ib)
+        old.shutdown(wait=False)
+
+    def _check_ib(self):
+        """
+        Runs on the IB thread. Connect if needed, make one round trip to TWS
+        and return the NetLiquidation (or TotalCashValue) summary row.
+
+        Under the scheduler the connection is kept for later checks, on its
+        own client id (ib_monitor_client_id) so it doesn't lock out one-shot
+        checks such as `pm list`, which connect on ib_client_id and
+        disconnect again when done.
+        """
         from ib_insync import IB
 
-        if not check_ib_valid_time():
-            self.job_logger.debug("Outside IB operating hours, stopping process.")
-            return False
+        timeout = getattr(self.config, "ib_timeout", 5)
+        persistent = self.persistent
 
-        try:
+        ib = getattr(self._ib_local, "ib", None)
+        if ib is None or not ib.isConnected():
+            self._disconnect_ib()
             ib = IB()
+            # Bound every request, not just the connect; a hung TWS would
+            # otherwise block the round trip below forever.
+            ib.RequestTimeout = timeout
 
             host = getattr(self.config, "ib_host", "127.0.0.1")
             port = getattr(self.config, "ib_port", 7497)
             client_id = getattr(self.config, "ib_client_id", 987)
-            timeout = getattr(self.config, "ib_timeout", 5)
+            if persistent:
+                client_id = getattr(self.config, "ib_monitor_client_id", client_id + 1)
 
             ib.connect(host, port, clientId=client_id, timeout=timeout)
+            self._ib_local.ib = ib
+
+        try:
+            # On a long-lived connection accountSummary() is served from the
+            # subscription cache, so ask TWS for something to prove it's alive.
+            ib.reqCurrentTime()
 
             summary = ib.accountSummary()
-            netliq = next((x for x in summary if x.tag == "NetLiquidation"), None) \
-                    or next((x for x in summary if x.tag == "TotalCashValue"), None)
+        finally:
+            if not persistent:
+                self._disconnect_ib()
+        netliq = next((x for x in summary if x.tag == "NetLiquidation"), None) \
+                or next((x for x in summary if x.tag == "TotalCashValue"), None)
+
+        if netliq is None:
+            raise RuntimeError("Connected to IB but accountSummary missing NetLiquidation/TotalCashValue")
+        return netliq
+
+    def _disconnect_ib(self):
+        """Runs on the IB thread."""
+        ib = getattr(self._ib_local, "ib", None)
+        self._ib_local.ib = None
+        if ib is not None:
+            try:
+                ib.disconnect()
+            except Exception as e:
+                self.job_logger.debug(f"Error disconnecting from IB: {e}")
 
-            if netliq is None:
-                raise RuntimeError("Connected to IB but accountSummary missing NetLiquidation/TotalCashValue")
+    def custom_monitor(self):
+        if not check_ib_valid_time():
+            self.job_logger.debug("Outside IB operating hours, stopping process.")
+            self._ib_executor.submit(self._disconnect_ib)
+            return False
 
-            self.job_logger.debug(f"IB online. {netliq.tag}={netliq.value} {netliq.currency}")
+        try:
+            future = self._ib_executor.submit(self._check_ib)
+            try:
+                netliq = future.result(timeout=self._ib_wait)
+            except TimeoutError:
+                self._reset_ib_executor()
+                raise TimeoutError(f"No answer from IB within {self._ib_wait}s")
 
-            ib.disconnect()
+            self.job_logger.debug(f"IB online. {netliq.tag}={netliq.value} {netliq.currency}")
 
             if self.is_down:
                 self.is_down = False
@@ -108,9 +187,11 @@ class TWS_Program(BaseProgram):
 
         except Exception as e:
             self.job_logger.error(f"Error fetching broker data: {e}")
+            # Reconnect from scratch on the next check.
+            self._ib_executor.submit(self._disconnect_ib)
 
             if not self.is_down:
                 self.is_down = True
                 return "RESTART"
 
-            return "SILENT_RESTART"
\ No newline at end of file
+            return "SILENT_RESTART"
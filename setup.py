@@ -5,6 +5,9 @@ setup(
     version="0.1.0",
     packages=find_packages(),         # now finds the processmanager/ folder
     install_requires=["appdirs"],
+    extras_require={
+        "fast": ["orjson"],
+    },
     entry_points={
         "console_scripts": [
             "pm = processmanager.cli:main",
@@ -0,0 +1,48 @@
+import tempfile
+import unittest
+from datetime import datetime
+
+from processmanager.config import Config
+from processmanager.core.Task import Task
+
+
+def _ts(s):
+    return datetime.fromisoformat(s).timestamp()
+
+
+class ComputeNextRunTest(unittest.TestCase):
+
+    def setUp(self):
+        d = tempfile.mkdtemp()
+        self.config = Config(schedule_file=f"{d}/s.json", status_dir=f"{d}/st", log_dir=f"{d}/log")
+
+    def make_task(self, **schedule):
+        return Task({"type": "task", "name": "t", "cmd": "x",
+                     "days": ["Mon", "Tue", "Wed", "Thu", "Fri"], **schedule}, self.config)
+
+    def next_run(self, task, now):
+        return datetime.fromtimestamp(task._compute_next_run(_ts(now)))
+
+    def test_freq_grid(self):
+        t = self.make_task(start="9:30 am", stop="4:00 pm", freq="15 m")
+        # 2026-10-15 is a Thursday
+        self.assertEqual(self.next_run(t, "2026-10-15 08:00"), datetime(2026, 10, 15, 9, 30))
+        self.assertEqual(self.next_run(t, "2026-10-15 10:07"), datetime(2026, 10, 15, 10, 15))
+        self.assertEqual(self.next_run(t, "2026-10-15 16:00"), datetime(2026, 10, 16, 9, 30))
+
+    def test_skips_disallowed_days(self):
+        t = self.make_task(start="9:30 am")
+        self.assertEqual(self.next_run(t, "2026-10-17 08:00"), datetime(2026, 10, 19, 9, 30))
+
+    def test_stop_before_start(self):
+        # The window is built on a single date, so stop < start means today's
+        # window has closed once we're past stop; the next run is the next
+        # allowed day's start, not today's.
+        t = self.make_task(start="10:00 pm", stop="2:00 am")
+        self.assertEqual(self.next_run(t, "2026-10-15 01:00"), datetime(2026, 10, 15, 22, 0))
+        self.assertEqual(self.next_run(t, "2026-10-15 10:00"), datetime(2026, 10, 16, 22, 0))
+        self.assertEqual(self.next_run(t, "2026-10-16 10:00"), datetime(2026, 10, 19, 22, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()